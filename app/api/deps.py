@@ -2,16 +2,6 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-import firebase_admin
-from firebase_admin import credentials, auth
-
-from app.core.config import settings
-
-# Initialise Firebase Admin exactly once
-if not firebase_admin._apps:
-    cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_FILE)
-    firebase_admin.initialize_app(cred)
-
 security = HTTPBearer()
 
 
@@ -19,14 +9,18 @@ def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
     """
-    Extract Bearer token from Authorization header and verify with Firebase.
+    Extract Bearer token from Authorization header and verify it against
+    Firebase's signing keys. Verified tokens are cached until they expire,
+    so repeat requests skip the signature check.
     Returns the decoded token (dict) on success.
     """
+    # Imported here: PyJWT/cryptography only load once auth is needed
+    from app.services.token_verifier import get_token_verifier
+
     token = credentials.credentials
 
     try:
-        decoded = auth.verify_id_token(token)
-        return decoded
+        return get_token_verifier().verify(token)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
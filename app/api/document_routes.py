@@ -1,8 +1,188 @@
-from fastapi import APIRouter
+# app/api/document_routes.py
+import os
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.db.database import get_db
+from app.db.models import Document
+from app.services.doc_search import search_documents
+from app.services.ocr_jobs import get_ocr_job_queue
+from app.services.users import get_or_create_user_id, get_user_id
 
 router = APIRouter(prefix="/api/docs", tags=["documents"])
 
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+
 
 @router.get("/")
-def list_documents():
-    return {"documents": []}
+def list_documents(
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = Query(None, ge=1),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    The user's documents, newest first:
+    GET /api/docs/?limit=20
+    Returns {"documents": [...], "next_before_id": 42}; pass
+    next_before_id as before_id for the next page (null on the last).
+    """
+    user_id = get_user_id(db, user.get("uid"))
+    if user_id is None:
+        return {"documents": [], "next_before_id": None}
+
+    # Served by ix_documents_user_id (its entries are ordered by id too)
+    query = db.query(
+        Document.id, Document.title, Document.status, Document.expiry_text,
+        Document.expiry_on, Document.created_at,
+    ).filter(Document.user_id == user_id)
+    if before_id is not None:
+        query = query.filter(Document.id < before_id)
+    rows = query.order_by(Document.id.desc()).limit(limit + 1).all()
+
+    page = rows[:limit]
+    return {
+        "documents": [
+            {
+                "id": row.id,
+                "title": row.title,
+                "status": row.status,
+                "expiry_date": row.expiry_text,
+                "expiry_date_iso": row.expiry_on.isoformat() if row.expiry_on else None,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+            for row in page
+        ],
+        "next_before_id": page[-1].id if len(rows) > limit else None,
+    }
+
+
+def save_upload(upload: UploadFile, extension: str) -> str:
+    """
+    Copy the upload to DOCUMENT_UPLOAD_DIR under a random name, enforcing
+    DOCUMENT_MAX_UPLOAD_BYTES. Returns the stored path.
+    """
+    os.makedirs(settings.DOCUMENT_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.DOCUMENT_UPLOAD_DIR, uuid.uuid4().hex + extension)
+
+    written = 0
+    with open(path, "wb") as out:
+        while True:
+            chunk = upload.file.read(64 * 1024)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > settings.DOCUMENT_MAX_UPLOAD_BYTES:
+                out.close()
+                os.remove(path)
+                raise HTTPException(status_code=413, detail="File too large")
+            out.write(chunk)
+    return path
+
+
+def create_document(db: Session, user: dict, title: str, path: str) -> Document:
+    doc = Document(
+        user_id=get_or_create_user_id(db, user.get("uid"), user.get("email")),
+        title=title,
+        file_path=path,
+        status="queued",
+    )
+    db.add(doc)
+    db.commit()
+    db.refresh(doc)
+    return doc
+
+
+def delete_document(db: Session, doc: Document):
+    db.delete(doc)
+    db.commit()
+    if os.path.exists(doc.file_path):
+        os.remove(doc.file_path)
+
+
+@router.post("", status_code=202)
+async def upload_document(
+    file: UploadFile = File(...),
+    title: Optional[str] = Form(None),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload a document image for OCR:
+    POST /api/docs  (multipart: file, optional title)
+    Returns 202 {"id": 7, "status": "queued"} straight away; OCR runs in
+    the background, poll GET /api/docs/{id} for the result.
+    Returns 429 when the OCR queue is full; retry later.
+    """
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+    jobs = get_ocr_job_queue()
+    # Cheap early reject before touching disk or the database
+    if jobs.is_full():
+        raise HTTPException(status_code=429, detail="OCR queue is full, retry later")
+
+    path = await run_in_threadpool(save_upload, file, extension)
+    doc = await run_in_threadpool(create_document, db, user, title or file.filename, path)
+
+    if not jobs.submit(doc.id):
+        # Filled up between the check and now
+        await run_in_threadpool(delete_document, db, doc)
+        raise HTTPException(status_code=429, detail="OCR queue is full, retry later")
+
+    return {"id": doc.id, "status": doc.status}
+
+
+# Declared before /{doc_id} so "search" is not taken for an id
+@router.get("/search")
+def search_docs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text search over the user's OCR'd documents:
+    GET /api/docs/search?q=policy number
+    Returns {"results": [{"id", "title", "expiry_date", "snippet"}, ...]}
+    ranked best match first; matches in the snippet are wrapped in [ ].
+    """
+    user_id = get_user_id(db, user.get("uid"))
+    if user_id is None:
+        return {"results": []}
+    return {"results": search_documents(db, user_id, q, limit)}
+
+
+@router.get("/{doc_id}")
+def get_document(
+    doc_id: int,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Status and OCR result of one of the user's documents:
+    GET /api/docs/7
+    status is queued, processing, done or failed.
+    """
+    user_id = get_user_id(db, user.get("uid"))
+    doc = db.get(Document, doc_id) if user_id is not None else None
+    if doc is None or doc.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    return {
+        "id": doc.id,
+        "title": doc.title,
+        "status": doc.status,
+        "ocr_text": doc.ocr_text,
+        "expiry_date": doc.expiry_text,
+        "expiry_date_iso": doc.expiry_on.isoformat() if doc.expiry_on else None,
+        "error": doc.error,
+        "created_at": doc.created_at.isoformat() if doc.created_at else None,
+    }
@@ -1,5 +1,7 @@
 # app/api/test_routes.py
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_user
 
 router = APIRouter(
     prefix="/api",
@@ -14,3 +16,14 @@ def ping():
     GET /api/ping
     """
     return {"status": "pong"}
+
+
+@router.get("/auth-metrics")
+def auth_metrics(user=Depends(get_current_user)):
+    """
+    Token verification cache stats (hit rate, average verify time):
+    GET /api/auth-metrics  (authenticated)
+    """
+    from app.services.token_verifier import token_verifier_stats
+
+    return token_verifier_stats()
@@ -1,11 +1,31 @@
 # app/api/trip_routes.py
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_current_user
-from app.db.database import get_db
-from app.db.models import Trip
-from app.services.gemini_client import ask_gemini
+from app.db.database import SessionLocal, get_db
+from app.db.models import ItineraryItem, Trip
+from app.services.gemini_client import ask_gemini_async, stream_gemini_async
+from app.services.itinerary import (
+    ItineraryStreamParser,
+    convert_ai_to_itinerary,
+    itinerary_item_rows,
+)
+from app.services.trip_cache import (
+    get_cached_itinerary,
+    get_or_generate_itinerary,
+    make_trip_cache_key,
+    store_itinerary,
+)
 
 router = APIRouter(
     prefix="/api/trip",
@@ -13,36 +33,6 @@ router = APIRouter(
 )
 
 
-def convert_ai_to_itinerary(text: str):
-    """
-    Convert Gemini plain text into a list of itinerary items.
-    Expects lines like:
-      - Day 1 - Visit ...
-      - Day 2 - ...
-    """
-    lines = text.split("\n")
-    items = []
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        if "-" in line:
-            title, detail = line.split("-", 1)
-        else:
-            title, detail = line, ""
-
-        items.append(
-            {
-                "title": title.strip(" -*\t"),
-                "detail": detail.strip(),
-                "eta": "Flexible",
-            }
-        )
-    return items
-
-
 @router.get("/test-auth")
 def test_auth(user=Depends(get_current_user)):
     """
@@ -56,8 +46,47 @@ def test_auth(user=Depends(get_current_user)):
     }
 
 
+def validate_trip_request(data: dict) -> int:
+    """
+    Check the generate body and return days as an int.
+    """
+    required = {"from", "to", "days", "style"}
+    if not required.issubset(data.keys()):
+        raise HTTPException(status_code=400, detail="Missing fields in request body")
+
+    try:
+        return int(data["days"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="days must be a number")
+
+
+def build_trip_prompt(data: dict) -> str:
+    return (
+        f"Create a {data['days']}-day road trip itinerary from {data['from']} to "
+        f"{data['to']} for a {data['style']} travel style. "
+        "Return bullet points like:\n"
+        "- Day 1 - morning & evening plan\n"
+        "- Day 2 - ... etc.\n"
+    )
+
+
+def save_trip(db: Session, trip: Trip, itinerary: list) -> Trip:
+    """
+    Insert the trip and its parsed itinerary items in one transaction,
+    the items as a single executemany.
+    """
+    db.add(trip)
+    db.flush()  # assigns trip.id
+    rows = itinerary_item_rows(trip.id, itinerary)
+    if rows:
+        db.execute(insert(ItineraryItem), rows)
+    db.commit()
+    db.refresh(trip)
+    return trip
+
+
 @router.post("/generate")
-def generate_trip(
+async def generate_trip(
     data: dict,
     user=Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -75,37 +104,227 @@ def generate_trip(
     Header: Authorization: Bearer <Firebase ID token>
     """
 
-    required = {"from", "to", "days", "style"}
-    if not required.issubset(data.keys()):
-        raise HTTPException(status_code=400, detail="Missing fields in request body")
+    days = validate_trip_request(data)
 
     # Build prompt for Gemini
-    prompt = (
-        f"Create a {data['days']}-day road trip itinerary from {data['from']} to "
-        f"{data['to']} for a {data['style']} travel style. "
-        "Return bullet points like:\n"
-        "- Day 1 - morning & evening plan\n"
-        "- Day 2 - ... etc.\n"
-    )
+    prompt = build_trip_prompt(data)
 
-    # Call Gemini
-    ai_text = ask_gemini(prompt)
+    # Call Gemini, unless this route/days/style is already cached
+    # (identical requests in flight share one call)
+    ai_text, cached = await get_or_generate_itinerary(
+        db, data, lambda: ask_gemini_async(prompt)
+    )
     itinerary = convert_ai_to_itinerary(ai_text)
 
-    # Save in DB
+    # Save in DB (blocking SQLAlchemy call, kept off the event loop)
     trip = Trip(
         user_id=user.get("uid"),
         from_place=data["from"],
         to_place=data["to"],
-        days=int(data["days"]),
+        days=days,
         style=data["style"],
         ai_raw_text=ai_text,
     )
-    db.add(trip)
-    db.commit()
-    db.refresh(trip)
+    trip = await run_in_threadpool(save_trip, db, trip, itinerary)
+
+    return {
+        "trip_id": trip.id,
+        "itinerary": itinerary,
+        "cached": cached,
+    }
+
+
+def _ndjson(event: dict) -> bytes:
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+
+async def _stream_trip(data: dict, days: int, uid: str):
+    # Own session: the stream outlives the request's dependencies
+    db = SessionLocal()
+    try:
+        key = make_trip_cache_key(data)
+        ai_text = await run_in_threadpool(get_cached_itinerary, db, key)
+        cached = ai_text is not None
+
+        itinerary = []
+        if cached:
+            itinerary = convert_ai_to_itinerary(ai_text)
+            for item in itinerary:
+                yield _ndjson({"type": "item", "item": item})
+        else:
+            # Emit each itinerary line as soon as Gemini finishes it
+            parser = ItineraryStreamParser()
+            async for chunk in stream_gemini_async(build_trip_prompt(data)):
+                for item in parser.feed(chunk):
+                    itinerary.append(item)
+                    yield _ndjson({"type": "item", "item": item})
+            for item in parser.close():
+                itinerary.append(item)
+                yield _ndjson({"type": "item", "item": item})
+
+            ai_text = parser.text
+            await run_in_threadpool(store_itinerary, db, key, ai_text)
+
+        trip = Trip(
+            user_id=uid,
+            from_place=data["from"],
+            to_place=data["to"],
+            days=days,
+            style=data["style"],
+            ai_raw_text=ai_text,
+        )
+        trip = await run_in_threadpool(save_trip, db, trip, itinerary)
+
+        yield _ndjson({"type": "done", "trip_id": trip.id, "cached": cached})
+
+    except Exception as e:
+        yield _ndjson({"type": "error", "detail": str(e)})
+    finally:
+        db.close()
+
+
+@router.post("/generate/stream")
+async def generate_trip_stream(
+    data: dict,
+    user=Depends(get_current_user),
+):
+    """
+    Streaming variant of /generate, same body and auth:
+    POST /api/trip/generate/stream
+    Responds with NDJSON, one event per line:
+      {"type": "item", "item": {"title": ..., "detail": ..., "eta": ...}}
+      ...
+      {"type": "done", "trip_id": 12, "cached": false}
+    or {"type": "error", "detail": ...} if Gemini fails mid-stream.
+    The Trip row is saved once the full itinerary has arrived.
+    """
+    days = validate_trip_request(data)
+
+    return StreamingResponse(
+        _stream_trip(data, days, user.get("uid")),
+        media_type="application/x-ndjson",
+    )
+
+
+HISTORY_MAX_LIMIT = 100
+
+
+def encode_cursor(created_at: datetime, trip_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), trip_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, trip_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(trip_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/history")
+def trip_history(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=HISTORY_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    include_raw: bool = False,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    The user's trips, newest first:
+    GET /api/trip/history?limit=20
+    GET /api/trip/history?limit=20&cursor=<next_cursor from previous page>
+    Add include_raw=true to get ai_raw_text as well.
+    Responds with {"trips": [...], "next_cursor": "..." or null} and an
+    ETag; send it back as If-None-Match to get 304 when nothing changed.
+    """
+    columns = [
+        Trip.id, Trip.from_place, Trip.to_place, Trip.days, Trip.style, Trip.created_at,
+    ]
+    if include_raw:
+        columns.append(Trip.ai_raw_text)
+
+    # Keyset pagination: seek past the last row of the previous page via
+    # ix_trips_user_id_created_at instead of counting OFFSET rows
+    query = select(*columns).where(Trip.user_id == user.get("uid"))
+    if cursor:
+        created_at, trip_id = decode_cursor(cursor)
+        query = query.where(tuple_(Trip.created_at, Trip.id) < tuple_(created_at, trip_id))
+    query = query.order_by(Trip.created_at.desc(), Trip.id.desc()).limit(limit + 1)
+
+    rows = db.execute(query).all()
+    page = rows[:limit]
+
+    trips = []
+    for row in page:
+        trip = {
+            "trip_id": row.id,
+            "from": row.from_place,
+            "to": row.to_place,
+            "days": row.days,
+            "style": row.style,
+            "created_at": row.created_at.isoformat(),
+        }
+        if include_raw:
+            trip["ai_raw_text"] = row.ai_raw_text
+        trips.append(trip)
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    body = {"trips": trips, "next_cursor": next_cursor}
+
+    etag = '"%s"' % hashlib.sha256(
+        json.dumps(body, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:32]
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return body
+
+
+@router.get("/{trip_id}")
+def get_trip(
+    trip_id: int,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    One of the user's trips with its itinerary:
+    GET /api/trip/12
+    Items come from itinerary_items; trips saved before that table
+    existed (and not yet backfilled) are parsed from ai_raw_text.
+    """
+    trip = db.execute(
+        select(Trip).where(Trip.id == trip_id, Trip.user_id == user.get("uid"))
+    ).scalar_one_or_none()
+    if trip is None:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    items = db.execute(
+        select(ItineraryItem.title, ItineraryItem.detail, ItineraryItem.eta)
+        .where(ItineraryItem.trip_id == trip.id)
+        .order_by(ItineraryItem.ordinal)
+    ).all()
+    if items:
+        itinerary = [{"title": i.title, "detail": i.detail, "eta": i.eta} for i in items]
+    else:
+        itinerary = convert_ai_to_itinerary(trip.ai_raw_text or "")
 
     return {
         "trip_id": trip.id,
+        "from": trip.from_place,
+        "to": trip.to_place,
+        "days": trip.days,
+        "style": trip.style,
+        "created_at": trip.created_at.isoformat() if trip.created_at else None,
         "itinerary": itinerary,
     }
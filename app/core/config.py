@@ -1,13 +1,39 @@
 # app/core/config.py
+import threading
 from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     GEMINI_API_KEY: str
+    GEMINI_MODEL: str = "gemini-1.5-flash"
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta"
+    GEMINI_TIMEOUT: float = 40
+    GEMINI_MAX_RETRIES: int = 2
     FIREBASE_CREDENTIALS_FILE: str = "firebase_key.json"
+    FIREBASE_TOKEN_CACHE_SIZE: int = 10000
     DATABASE_URL: str = "sqlite:///./autocompanion.db"
+    # SQLite tuning (ignored for other databases)
+    DB_SQLITE_WAL: bool = True
+    DB_SQLITE_SYNCHRONOUS: str = "NORMAL"
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    DB_SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # Connection pool (server databases such as Postgres)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
     CORS_ORIGINS: List[str] = ["*"]
+    TRIP_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    # Document uploads and their background OCR
+    DOCUMENT_UPLOAD_DIR: str = "uploads"
+    DOCUMENT_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    OCR_JOB_WORKERS: int = 2
+    OCR_JOB_QUEUE_SIZE: int = 100
+    # A "processing" claim older than this lost its worker and is requeued
+    OCR_JOB_STALE_SECONDS: int = 600
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -15,4 +41,28 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """
+    Read .env / environment once, on first use, from whichever thread
+    gets there first.
+    """
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+
+class _LazySettings:
+    # Keeps `from app.core.config import settings` working without
+    # building Settings at import time
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+
+settings = _LazySettings()
@@ -0,0 +1,27 @@
+# app/core/firebase.py
+import threading
+
+from app.core.config import settings
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_firebase_app():
+    """
+    Initialise Firebase Admin exactly once, on first use. firebase_admin
+    and the credentials file are only loaded when a route needs auth.
+    """
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                import firebase_admin
+                from firebase_admin import credentials
+
+                if firebase_admin._apps:
+                    _app = firebase_admin.get_app()
+                else:
+                    cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_FILE)
+                    _app = firebase_admin.initialize_app(cred)
+    return _app
@@ -0,0 +1,80 @@
+# app/db/backfill_itinerary_items.py
+# Fill itinerary_items for trips saved before the table existed:
+#
+#   python -m app.db.backfill_itinerary_items [--batch-size N]
+#
+# Walks trips by id in batches (keyset, never the whole table in memory),
+# parses each ai_raw_text once and bulk-inserts the items, committing per
+# batch so it can be stopped and re-run: trips that already have items
+# are skipped.
+import argparse
+import time
+
+from sqlalchemy import exists, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models import ItineraryItem, Trip
+from app.services.itinerary import convert_ai_to_itinerary, itinerary_item_rows
+
+
+def backfill_batch(db: Session, after_id: int, batch_size: int):
+    """
+    Backfill the next batch of trips with id > after_id that have no
+    items. Returns (last trip id or None when done, trips, items inserted).
+    """
+    has_items = exists().where(ItineraryItem.trip_id == Trip.id)
+    trips = db.execute(
+        select(Trip.id, Trip.ai_raw_text)
+        .where(Trip.id > after_id, ~has_items)
+        .order_by(Trip.id)
+        .limit(batch_size)
+    ).all()
+    if not trips:
+        return None, 0, 0
+
+    rows = []
+    for trip in trips:
+        rows.extend(itinerary_item_rows(trip.id, convert_ai_to_itinerary(trip.ai_raw_text or "")))
+    if rows:
+        db.execute(insert(ItineraryItem), rows)
+    db.commit()
+
+    return trips[-1].id, len(trips), len(rows)
+
+
+def backfill(db: Session, batch_size: int = 500):
+    after_id, trips_done, items_done = 0, 0, 0
+    start = time.perf_counter()
+
+    while True:
+        last_id, trips, items = backfill_batch(db, after_id, batch_size)
+        if last_id is None:
+            break
+        after_id = last_id
+        trips_done += trips
+        items_done += items
+        print(f"… up to trip {after_id}: {trips_done} trips, {items_done} items")
+
+    print(
+        f"✅ Backfill done: {trips_done} trips, {items_done} items "
+        f"in {time.perf_counter() - start:.1f} s"
+    )
+    return trips_done, items_done
+
+
+def main():
+    from app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        backfill(db, args.batch_size)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
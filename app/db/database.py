@@ -1,23 +1,98 @@
 # app/db/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from app.core.config import settings
 
-# SQLite needs this connect_args
-connect_args = (
-    {"check_same_thread": False}
-    if settings.DATABASE_URL.startswith("sqlite")
-    else {}
-)
+Base = declarative_base()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args,
-)
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+
+def engine_options(url: str) -> dict:
+    """
+    create_engine() keyword arguments for this kind of database.
+    SQLite: a busy wait instead of failing straight away with
+    "database is locked". Others: pool sizing, pre-ping and recycle.
+    """
+    if url.startswith("sqlite"):
+        # SQLite needs check_same_thread off: sessions move between the
+        # threadpool workers
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.DB_SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        }
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside the single writer, and with
+    # synchronous=NORMAL a commit no longer waits for an fsync
+    synchronous = settings.DB_SQLITE_SYNCHRONOUS.upper()
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"DB_SQLITE_SYNCHRONOUS must be one of {sorted(SQLITE_SYNCHRONOUS_MODES)}")
+
+    cursor = dbapi_connection.cursor()
+    if settings.DB_SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.DB_SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def create_db_engine(url: str):
+    engine = create_engine(url, **engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+_engine = None
+_sessionmaker = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Engine (and its session factory) built on first use rather than at
+    import, so importing the app does not read settings or open the pool.
+    """
+    global _engine, _sessionmaker
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_db_engine(settings.DATABASE_URL)
+                _sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def SessionLocal() -> Session:
+    # Same call signature as the old module-level sessionmaker
+    get_engine()
+    return _sessionmaker()
+
+
+def init_db():
+    """
+    Bring the schema up to date (app/db/migrations.py). Run once at app
+    startup, not on import.
+    """
+    from app.db.migrations import run_migrations
+
+    run_migrations(get_engine())
 
 
 def get_db():
@@ -0,0 +1,318 @@
+# app/db/migrations.py
+# Versioned schema migrations, applied in order at startup (init_db) or by
+# hand with:
+#
+#   python -m app.db.migrations            # apply pending
+#   python -m app.db.migrations --status   # list applied / pending
+#
+# Each migration runs in its own transaction, together with the row that
+# records it in schema_migrations, so concurrent workers starting at the
+# same time apply it exactly once. Migrations are frozen: never edit one
+# that has shipped, add a new one instead. Table definitions here are
+# deliberately local copies, not the models.
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    inspect,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _columns(conn, table: str) -> set:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _indexes(conn, table: str) -> set:
+    return {i["name"] for i in inspect(conn).get_indexes(table)}
+
+
+def _reflect(conn, table: str) -> Table:
+    return Table(table, MetaData(), autoload_with=conn)
+
+
+def baseline(conn):
+    # The tables the live autocompanion.db already has (created by an
+    # earlier version of the app); IF NOT EXISTS semantics so existing
+    # databases adopt the migration history without changes.
+    metadata = MetaData()
+    Table(
+        "users", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("uid", String, unique=True),
+        Column("email", String),
+    )
+    Table(
+        "trips", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", String),
+        Column("from_place", String, nullable=False),
+        Column("to_place", String, nullable=False),
+        Column("days", Integer, nullable=False),
+        Column("style", String, nullable=False),
+        Column("ai_raw_text", Text),
+    )
+    Table(
+        "documents", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer),
+        Column("title", String),
+        Column("file_path", String),
+        Column("ocr_text", Text),
+    )
+    Table(
+        "service_records", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer),
+        Column("date", String),
+        Column("desc", String),
+    )
+    Table(
+        "emergency_events", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer),
+        Column("message", String),
+        Column("created_at", DateTime),
+    )
+    metadata.create_all(conn, checkfirst=True)
+
+
+def trip_created_at_and_cache(conn):
+    # Databases made by create_all from the old Trip model lack
+    # created_at; the live one already has it
+    if "created_at" not in _columns(conn, "trips"):
+        column_type = DateTime().compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE trips ADD COLUMN created_at {column_type}"))
+
+    metadata = MetaData()
+    Table(
+        "trip_cache", metadata,
+        Column("cache_key", String, primary_key=True),
+        Column("ai_raw_text", Text, nullable=False),
+        Column("expires_at", DateTime, nullable=False, index=True),
+    )
+    metadata.create_all(conn, checkfirst=True)
+
+
+def per_user_indexes(conn):
+    # Per-user listings: trips newest first, documents, service history
+    # by date. ix_trips_user_id is a prefix of the new trips index and
+    # ix_trips_id duplicates the primary key.
+    trips = _reflect(conn, "trips")
+    existing = _indexes(conn, "trips")
+    for name in ("ix_trips_user_id", "ix_trips_id"):
+        if name in existing:
+            conn.execute(text(f"DROP INDEX {name}"))
+    Index(
+        "ix_trips_user_id_created_at",
+        trips.c.user_id, trips.c.created_at.desc(), trips.c.id.desc(),
+    ).create(conn, checkfirst=True)
+
+    documents = _reflect(conn, "documents")
+    Index("ix_documents_user_id", documents.c.user_id).create(conn, checkfirst=True)
+
+    service_records = _reflect(conn, "service_records")
+    Index(
+        "ix_service_records_user_id_date",
+        service_records.c.user_id, service_records.c.date,
+    ).create(conn, checkfirst=True)
+
+
+def backfill_trip_created_at(conn):
+    # Keyset pagination compares (created_at, id); rows from before
+    # created_at existed get the epoch, so they list last, by id
+    conn.execute(text(
+        "UPDATE trips SET created_at = '1970-01-01 00:00:00.000000' "
+        "WHERE created_at IS NULL"
+    ))
+
+
+def itinerary_items(conn):
+    # Parsed itinerary stored at write time; existing trips are filled in
+    # by python -m app.db.backfill_itinerary_items
+    metadata = MetaData()
+    Table("trips", metadata, Column("id", Integer, primary_key=True))
+    Table(
+        "itinerary_items", metadata,
+        Column("trip_id", Integer, ForeignKey("trips.id"), primary_key=True),
+        Column("ordinal", Integer, primary_key=True, autoincrement=False),
+        Column("day", Integer),
+        Column("title", String, nullable=False),
+        Column("detail", Text, nullable=False),
+        Column("eta", String, nullable=False),
+    )
+    metadata.tables["itinerary_items"].create(conn, checkfirst=True)
+
+
+def document_ocr_jobs(conn):
+    # Status and results of the background OCR queue (POST /api/docs)
+    existing = _columns(conn, "documents")
+    columns = [
+        ("status", "VARCHAR NOT NULL DEFAULT 'done'"),
+        ("expiry_text", "VARCHAR"),
+        ("error", "TEXT"),
+        ("created_at", DateTime().compile(dialect=conn.dialect)),
+    ]
+    for name, ddl in columns:
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE documents ADD COLUMN {name} {ddl}"))
+
+
+def documents_fts(conn):
+    # SQLite only: FTS5 index over title + ocr_text, external content
+    # (no second copy of the text), kept in sync by triggers. user_id is
+    # indexed too so a per-user search is one posting-list intersection
+    # (user_id:7 AND ...) rather than a join filtering every match.
+    # Other databases search with a plain scan (app/services/doc_search.py).
+    if conn.dialect.name != "sqlite":
+        return
+    for statement in (
+        """CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+            user_id, title, ocr_text, content='documents', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS documents_fts_ai AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts(rowid, user_id, title, ocr_text)
+            VALUES (new.id, new.user_id, new.title, new.ocr_text);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS documents_fts_ad AFTER DELETE ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, user_id, title, ocr_text)
+            VALUES ('delete', old.id, old.user_id, old.title, old.ocr_text);
+        END""",
+        # Only when the indexed columns change, not on every status update
+        """CREATE TRIGGER IF NOT EXISTS documents_fts_au AFTER UPDATE OF user_id, title, ocr_text ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, user_id, title, ocr_text)
+            VALUES ('delete', old.id, old.user_id, old.title, old.ocr_text);
+            INSERT INTO documents_fts(rowid, user_id, title, ocr_text)
+            VALUES (new.id, new.user_id, new.title, new.ocr_text);
+        END""",
+        "INSERT INTO documents_fts(documents_fts) VALUES ('rebuild')",
+    ):
+        conn.execute(text(statement))
+
+
+def expiry_reminders(conn):
+    # Normalised expiry date for range scans, and the reminders the
+    # scheduler (app/services/expiry_reminders.py) emits. Existing rows
+    # are filled by python -m app.services.expiry_reminders --backfill.
+    if "expiry_on" not in _columns(conn, "documents"):
+        column_type = Date().compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE documents ADD COLUMN expiry_on {column_type}"))
+
+    documents = _reflect(conn, "documents")
+    Index("ix_documents_expiry_on", documents.c.expiry_on, documents.c.id).create(conn, checkfirst=True)
+
+    metadata = MetaData()
+    Table("documents", metadata, Column("id", Integer, primary_key=True))
+    notifications = Table(
+        "notifications", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False, index=True),
+        Column("document_id", Integer, ForeignKey("documents.id"), nullable=False),
+        Column("kind", String, nullable=False),
+        Column("days_before", Integer, nullable=False),
+        Column("message", String, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("sent_at", DateTime),
+        UniqueConstraint("document_id", "kind", "days_before", name="uq_notifications_document_kind_days"),
+    )
+    notifications.create(conn, checkfirst=True)
+
+
+def document_job_claims(conn):
+    # When an OCR worker claimed the document: only claims older than
+    # OCR_JOB_STALE_SECONDS are requeued at startup
+    if "claimed_at" not in _columns(conn, "documents"):
+        column_type = DateTime().compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE documents ADD COLUMN claimed_at {column_type}"))
+
+
+# (version, name, upgrade(conn)) in the order they must run
+MIGRATIONS = [
+    (1, "baseline", baseline),
+    (2, "trip_created_at_and_cache", trip_created_at_and_cache),
+    (3, "per_user_indexes", per_user_indexes),
+    (4, "backfill_trip_created_at", backfill_trip_created_at),
+    (5, "itinerary_items", itinerary_items),
+    (6, "document_ocr_jobs", document_ocr_jobs),
+    (7, "documents_fts", documents_fts),
+    (8, "expiry_reminders", expiry_reminders),
+    (9, "document_job_claims", document_job_claims),
+]
+
+
+def applied_versions(engine) -> set:
+    with engine.begin() as conn:
+        # IF NOT EXISTS rather than checkfirst: workers race to create it
+        conn.execute(CreateTable(schema_migrations, if_not_exists=True))
+        return {row.version for row in conn.execute(schema_migrations.select())}
+
+
+def run_migrations(engine) -> list:
+    """
+    Apply every pending migration in order and return the versions this
+    call applied. A migration another process applied first is skipped.
+    """
+    done = applied_versions(engine)
+    applied = []
+
+    for version, name, upgrade in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            with engine.begin() as conn:
+                # Claim the version first: this takes the write lock, so a
+                # second worker waits here and then sees the duplicate key
+                conn.execute(
+                    schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow())
+                )
+                upgrade(conn)
+        except IntegrityError:
+            continue
+        applied.append(version)
+        print(f"✅ Applied migration {version:04d} {name}")
+
+    return applied
+
+
+def main():
+    import argparse
+
+    from app.db.database import get_engine
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--status", action="store_true")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if args.status:
+        done = applied_versions(engine)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:04d} {name:<30} {'applied' if version in done else 'pending'}")
+        return
+
+    if not run_migrations(engine):
+        print("Schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,115 @@
 # app/db/models.py
-from sqlalchemy import Column, Integer, String, Text
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 
 from app.db.database import Base
 
+# Schema changes go through app/db/migrations.py; these models must
+# describe the tables exactly as the migrations leave them.
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    uid = Column(String, unique=True)            # Firebase UID
+    email = Column(String)
+
 
 class Trip(Base):
     __tablename__ = "trips"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)         # Firebase UID (string)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String)                     # Firebase UID (string)
     from_place = Column(String, nullable=False)
     to_place = Column(String, nullable=False)
     days = Column(Integer, nullable=False)
     style = Column(String, nullable=False)
     ai_raw_text = Column(Text)                   # Full Gemini response text
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Per-user history, newest first (id breaks created_at ties)
+Index("ix_trips_user_id_created_at", Trip.user_id, Trip.created_at.desc(), Trip.id.desc())
+
+
+class ItineraryItem(Base):
+    __tablename__ = "itinerary_items"
+
+    # (trip_id, ordinal) is the read path: one trip's items in order
+    trip_id = Column(Integer, ForeignKey("trips.id"), primary_key=True)
+    ordinal = Column(Integer, primary_key=True, autoincrement=False)
+    day = Column(Integer)                        # None before the first "Day N"
+    title = Column(String, nullable=False)
+    detail = Column(Text, nullable=False)
+    eta = Column(String, nullable=False)
+
+
+class TripCache(Base):
+    __tablename__ = "trip_cache"
+
+    cache_key = Column(String, primary_key=True)  # normalized from|to|days|style
+    ai_raw_text = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class Document(Base):
+    __tablename__ = "documents"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True)        # users.id
+    title = Column(String)
+    file_path = Column(String)
+    ocr_text = Column(Text)
+    # queued -> processing -> done | failed (rows older than the OCR
+    # queue are "done")
+    status = Column(String, nullable=False, default="queued", server_default="done")
+    expiry_text = Column(String)                 # expiry as printed, e.g. "28th May 2024"
+    expiry_on = Column(Date)                     # the same date, queryable
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime)                # when an OCR worker took it
+
+
+# Reminder scans: range over expiry_on, keyset-paged by id
+Index("ix_documents_expiry_on", Document.expiry_on, Document.id)
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # One reminder per document per threshold, however often the
+        # scheduler runs
+        UniqueConstraint("document_id", "kind", "days_before", name="uq_notifications_document_kind_days"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)   # users.id
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
+    kind = Column(String, nullable=False)                   # e.g. "expiry_reminder"
+    days_before = Column(Integer, nullable=False)
+    message = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime)                              # set by whatever delivers it
+
+
+class ServiceRecord(Base):
+    __tablename__ = "service_records"
+    __table_args__ = (
+        Index("ix_service_records_user_id_date", "user_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer)
+    date = Column(String)
+    description = Column("desc", String)
+
+
+class EmergencyEvent(Base):
+    __tablename__ = "emergency_events"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer)
+    message = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
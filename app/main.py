@@ -1,25 +1,65 @@
 # app/main.py
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from app.core.config import settings
-from app.db.database import Base, engine
+from app.core.config import get_settings
+from app.db.database import init_db
+from app.services.ocr_jobs import requeue_unfinished
+from app.api.document_routes import router as document_router
 from app.api.test_routes import router as test_router
 from app.api.trip_routes import router as trip_router
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="AutoCompanion Backend")
+def _warm_auth():
+    # Firebase Admin + signing certs, off the startup path so the worker
+    # starts serving right away; the first authed request finds them ready
+    try:
+        from app.services.token_verifier import get_token_verifier
+
+        get_token_verifier()
+    except Exception as e:
+        print("⚠️ Auth warm-up failed, will retry on first request:", e)
+
+
+class LazyCORSMiddleware:
+    """
+    CORSMiddleware built on the first request (or lifespan event), so
+    importing app.main doesn't read .env just for the allowed origins.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._cors = None
+
+    async def __call__(self, scope, receive, send):
+        if self._cors is None:
+            self._cors = CORSMiddleware(
+                self.app,
+                allow_origins=get_settings().CORS_ORIGINS,
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            )
+        await self._cors(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create DB tables
+    await run_in_threadpool(init_db)
+    await run_in_threadpool(requeue_unfinished)
+    threading.Thread(target=_warm_auth, name="auth-warmup", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="AutoCompanion Backend", lifespan=lifespan)
 
 # CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(LazyCORSMiddleware)
 
 
 @app.get("/")
@@ -30,3 +70,4 @@ def root():
 # Routers
 app.include_router(test_router)
 app.include_router(trip_router)
+app.include_router(document_router)
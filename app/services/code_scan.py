@@ -0,0 +1,82 @@
+# app/services/code_scan.py
+import threading
+
+import cv2
+
+from app.services.date_extract import extract_expiry
+
+# Codes are located on a proxy this size (detection cost grows with
+# pixels); a QR found there but too small to read is decoded again from
+# the full-resolution crop
+CODE_PROBE_SIDE = 1000
+
+# OpenCV detector objects keep state between calls: one set per thread
+_local = threading.local()
+
+
+def _detectors():
+    if not hasattr(_local, "qr"):
+        _local.qr = cv2.QRCodeDetector()
+        # 1-D barcodes need OpenCV >= 4.8
+        _local.barcode = cv2.barcode.BarcodeDetector() if hasattr(cv2, "barcode") else None
+    return _local.qr, _local.barcode
+
+
+def _decode_full_res(qr, gray, points, margin=0.15):
+    # Crop the located QR (plus quiet zone) out of the full-size image
+    points = points.reshape(-1, 2)
+    (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+    pad = max(x1 - x0, y1 - y0) * margin
+    h, w = gray.shape[:2]
+    crop = gray[
+        max(int(y0 - pad), 0):min(int(y1 + pad), h),
+        max(int(x0 - pad), 0):min(int(x1 + pad), w),
+    ]
+    if crop.size == 0:
+        return ""
+    decoded, _, _ = qr.detectAndDecode(crop)
+    return decoded
+
+
+def decode_codes(gray, probe_side=CODE_PROBE_SIDE):
+    """
+    Text payloads of the QR codes and barcodes found on a downscaled
+    copy of gray (empty list when there are none).
+    """
+    scale = min(1.0, probe_side / max(gray.shape[:2]))
+    probe = gray
+    if scale < 1.0:
+        probe = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    qr, barcode = _detectors()
+    payloads = []
+
+    # Single-code detection: a card carries one QR, and the multi-code
+    # detector is an order of magnitude slower
+    found, points = qr.detect(probe)
+    if found:
+        decoded, _ = qr.decode(probe, points)
+        if not decoded and scale < 1.0:
+            decoded = _decode_full_res(qr, gray, points / scale)
+        if decoded:
+            payloads.append(decoded)
+
+    if barcode is not None:
+        ok, decoded, _, _ = barcode.detectAndDecodeWithType(probe)
+        if ok:
+            payloads.extend(d for d in decoded if d)
+
+    return payloads
+
+
+def expiry_from_codes(gray):
+    """
+    (payload, DateCandidate) for the first code whose payload has a date
+    right after a validity/expiry keyword, else None. Dates without a
+    keyword (issue dates, serials) don't count: those documents go to OCR.
+    """
+    for payload in decode_codes(gray):
+        expiry = extract_expiry(payload)
+        if expiry is not None and expiry.score > 0:
+            return payload, expiry
+    return None
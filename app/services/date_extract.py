@@ -0,0 +1,141 @@
+# app/services/date_extract.py
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional
+
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+    r"(?![a-z])"
+)
+_ORDINAL = r"\s*(?:st|nd|rd|th)?"
+
+# One alternation, scanned once: validity keywords and every date layout
+# we see on RC / PUC / insurance / DL scans. Keywords are matched in the
+# same pass so each date knows how far back the last keyword was.
+# Everything starts on a word boundary, which lets the engine skip
+# mid-word positions without trying any alternative.
+_SCANNER = re.compile(
+    r"\b(?:"
+    # valid till / valid upto / validity / expiry date / expires ...
+    r"(?P<kw>valid\s*(?:till|upto|up\s*to|through|thru|to)|validity|\b(?:upto|up\s+to|till)\b"
+    r"|expiry(?:\s*date)?|expires?|exp\.?\s*date|date\s*of\s*expiry)"
+    # labels of dates that are NOT the expiry: they end the keyword's reach
+    r"|(?P<other>\b(?:issued?|date\s*of\s*(?:birth|issue|registration)|reg(?:istration)?\.?\s*date"
+    r"|dob|from|printed|inception)\b)"
+    # 28th May 2024, 28 of May, 2024, 31-Mar-2024, 15-Aug-23
+    rf"|(?P<d1>(?<!\d)\d{{1,2}}){_ORDINAL}[\s\-/.]*(?:of\s*)?(?P<m1>{_MONTH})"
+    r"(?:[,.\s\-/]*(?P<y1>\d{4})|[\-/.](?P<y1s>\d{2}))(?!\d)"
+    # May 28 2024, May 28th, 2024
+    rf"|(?P<m2>{_MONTH})\s*(?P<d2>\d{{1,2}}){_ORDINAL}[,.\s]*(?P<y2>\d{{4}})(?!\d)"
+    # 2024/05/28, 2024-05-28
+    r"|(?<!\d)(?P<y3>\d{4})[/\-.](?P<m3>\d{1,2})[/\-.](?P<d3>\d{1,2})(?!\d)"
+    # 28/05/2024, 28-05-24, 28.05.2024
+    r"|(?<!\d)(?P<d4>\d{1,2})[/\-.](?P<m4>\d{1,2})[/\-.](?P<y4>\d{4}|\d{2})(?!\d)"
+    r")",
+    re.IGNORECASE,
+)
+
+# A keyword further back than this does not describe the date
+KEYWORD_WINDOW = 80
+
+
+@dataclass
+class DateCandidate:
+    text: str        # as it appears in the OCR text
+    start: int
+    end: int
+    iso: str         # YYYY-MM-DD
+    score: float     # 0..1, 1 = right after an expiry keyword
+
+
+def _month_number(token):
+    return MONTHS[token[:3].lower()]
+
+
+def _to_date(day, month, year):
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _parse(m):
+    if m.group("d1"):
+        year = m.group("y1") or m.group("y1s")
+        return _to_date(int(m.group("d1")), _month_number(m.group("m1")), int(year))
+    if m.group("m2"):
+        return _to_date(int(m.group("d2")), _month_number(m.group("m2")), int(m.group("y2")))
+    if m.group("y3"):
+        return _to_date(int(m.group("d3")), int(m.group("m3")), int(m.group("y3")))
+
+    # Numeric dates on Indian documents are day-first; only read them as
+    # month-first when day-first is impossible (05/28/2024)
+    day, month, year = int(m.group("d4")), int(m.group("m4")), int(m.group("y4"))
+    if month > 12 >= day:
+        day, month = month, day
+    return _to_date(day, month, year)
+
+
+def find_dates(text: str) -> List[DateCandidate]:
+    """
+    All dates in text, in order, with ISO value and keyword proximity score.
+    """
+    candidates = []
+    last_keyword_end = None
+
+    for m in _SCANNER.finditer(text):
+        if m.group("kw"):
+            last_keyword_end = m.end()
+            continue
+        if m.group("other"):
+            last_keyword_end = None
+            continue
+
+        parsed = _parse(m)
+        if parsed is None:
+            continue
+
+        score = 0.0
+        if last_keyword_end is not None:
+            distance = m.start() - last_keyword_end
+            if distance <= KEYWORD_WINDOW:
+                score = 1.0 - distance / (KEYWORD_WINDOW + 1)
+
+        candidates.append(
+            DateCandidate(
+                text=" ".join(m.group(0).split()),
+                start=m.start(),
+                end=m.end(),
+                iso=parsed.isoformat(),
+                score=score,
+            )
+        )
+
+    return candidates
+
+
+def pick_expiry(candidates: List[DateCandidate]) -> Optional[DateCandidate]:
+    """
+    Latest date that follows an expiry keyword; if no date has a keyword
+    nearby, the latest date overall (validity ends after issue dates).
+    """
+    if not candidates:
+        return None
+
+    near_keyword = [c for c in candidates if c.score > 0]
+    pool = near_keyword or candidates
+    return max(pool, key=lambda c: (c.iso, c.score))
+
+
+def extract_expiry(text: str) -> Optional[DateCandidate]:
+    return pick_expiry(find_dates(text))
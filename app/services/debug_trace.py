@@ -0,0 +1,114 @@
+# app/services/debug_trace.py
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+import uuid
+
+import cv2
+
+
+class TraceSink:
+    """
+    Opt-in sink for OCR debug images (raw download, preprocessed frame).
+
+    Off by default. A request is traced when it asks for it or when it
+    falls in the sampled percentage. Images are JPEG-encoded and written
+    on a background thread into <root>/<trace_id>/, and only the newest
+    max_traces directories are kept, so the request path only pays for a
+    queue put.
+    """
+
+    def __init__(self, root: str, sample_percent: float = 0, max_traces: int = 50, queue_size: int = 64):
+        if max_traces < 1:
+            raise ValueError("max_traces must be at least 1 (OCR_TRACE_MAX)")
+        self.root = root
+        self.sample_percent = sample_percent
+        self.max_traces = max_traces
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start_trace(self, force: bool = False):
+        """
+        Return a new trace id if this request should be traced, else None.
+        """
+        if not force and not (self.sample_percent > 0 and random.uniform(0, 100) < self.sample_percent):
+            return None
+
+        # Sortable by time so retention can drop the oldest first
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 1_000_000_000))
+        return f"{stamp}.{now % 1_000_000_000:09d}-{uuid.uuid4().hex[:6]}"
+
+    def submit(self, trace_id, name: str, img):
+        """
+        Queue img to be written as <trace_id>/<name>. No-op without a trace
+        id; dropped (never blocks) if the writer is behind.
+        """
+        if trace_id is None:
+            return
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((trace_id, name, img))
+        except queue.Full:
+            print("⚠️ Debug trace queue full, dropped", trace_id, name)
+
+    def _ensure_writer(self):
+        # Started lazily so OCR worker processes get their own writer
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="ocr-trace-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            trace_id, name, img = self._queue.get()
+            try:
+                trace_dir = os.path.join(self.root, trace_id)
+                is_new = not os.path.isdir(trace_dir)
+                os.makedirs(trace_dir, exist_ok=True)
+                cv2.imwrite(os.path.join(trace_dir, name), img)
+                if is_new:
+                    self._enforce_retention()
+            except Exception as e:
+                print("❌ Debug trace write failed:", e)
+            finally:
+                self._queue.task_done()
+
+    def _enforce_retention(self):
+        traces = sorted(
+            d for d in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, d))
+        )
+        for old in traces[:max(len(traces) - self.max_traces, 0)]:
+            shutil.rmtree(os.path.join(self.root, old), ignore_errors=True)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_trace_sink() -> TraceSink:
+    """
+    Process-wide sink configured from the environment:
+      OCR_TRACE_DIR             (default ocr_traces)
+      OCR_TRACE_SAMPLE_PERCENT  (default 0, i.e. only on request)
+      OCR_TRACE_MAX             (default 50 trace directories kept)
+    """
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = TraceSink(
+                    root=os.environ.get("OCR_TRACE_DIR", "ocr_traces"),
+                    sample_percent=float(os.environ.get("OCR_TRACE_SAMPLE_PERCENT", 0)),
+                    max_traces=int(os.environ.get("OCR_TRACE_MAX", 50)),
+                )
+    return _sink
@@ -0,0 +1,81 @@
+# app/services/doc_search.py
+import re
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Document
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+SNIPPET_TOKENS = 12
+
+
+def fts_query(q: str) -> str:
+    """
+    User input -> FTS5 MATCH expression over title/ocr_text: every word
+    must appear, the last one as a prefix (so "chass" finds "chassis").
+    Words are quoted, so operators and punctuation in the input can't
+    break the query.
+    """
+    words = _WORD.findall(q)
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return "{title ocr_text}: (" + " ".join(terms) + ")"
+
+
+_FTS_SEARCH = text(
+    f"""
+    SELECT d.id, d.title, d.expiry_text,
+           snippet(documents_fts, 2, '[', ']', '…', {SNIPPET_TOKENS}) AS snippet
+    FROM documents_fts
+    JOIN documents AS d ON d.id = documents_fts.rowid
+    WHERE documents_fts MATCH :match
+    ORDER BY bm25(documents_fts, 0.0, 2.0, 1.0)  -- ignore user_id, favour title
+    LIMIT :limit
+    """
+)
+
+
+def search_documents(db: Session, user_id: int, q: str, limit: int = 20) -> list:
+    """
+    The user's documents matching q, best match first, each with a short
+    snippet of the OCR text around the hits (marked with [ ]).
+    """
+    match = fts_query(q)
+    if not match:
+        return []
+
+    if db.get_bind().dialect.name == "sqlite":
+        # Scope inside the MATCH: FTS5 intersects the user's posting list
+        # with the words' instead of ranking everyone's matches first
+        scoped = f'user_id: "{int(user_id)}" AND {match}'
+        rows = db.execute(_FTS_SEARCH, {"match": scoped, "limit": limit})
+        return [
+            {"id": r.id, "title": r.title, "expiry_date": r.expiry_text, "snippet": r.snippet}
+            for r in rows
+        ]
+
+    # No FTS5 outside SQLite: substring scan, per-user thanks to
+    # ix_documents_user_id, newest first
+    words = _WORD.findall(q)
+    conditions = [
+        or_(Document.ocr_text.ilike(f"%{w}%"), Document.title.ilike(f"%{w}%")) for w in words
+    ]
+    rows = db.execute(
+        select(Document.id, Document.title, Document.expiry_text, Document.ocr_text)
+        .where(Document.user_id == user_id, *conditions)
+        .order_by(Document.id.desc())
+        .limit(limit)
+    )
+    return [
+        {
+            "id": r.id,
+            "title": r.title,
+            "expiry_date": r.expiry_text,
+            "snippet": (r.ocr_text or "")[:200],
+        }
+        for r in rows
+    ]
@@ -0,0 +1,168 @@
+# app/services/expiry_reminders.py
+# Reminders before a document (insurance, PUC, RC, ...) expires:
+#
+#   python -m app.services.expiry_reminders                # one pass
+#   python -m app.services.expiry_reminders --every 3600   # keep running
+#   python -m app.services.expiry_reminders --backfill     # fill expiry_on
+#
+# A pass range-scans ix_documents_expiry_on over [today, today + the
+# longest lead time], so its cost follows the number of documents about
+# to expire, not the size of the table. Notifications are unique per
+# (document, kind, days_before), so passes can overlap or repeat.
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.db.models import Document, Notification
+from app.services.date_extract import extract_expiry
+
+# Remind this many days ahead, longest first
+REMINDER_DAYS = (30, 7, 1)
+KIND = "expiry_reminder"
+
+
+def reminder_threshold(days_left: int):
+    """
+    The tightest lead time days_left falls within: 12 days left -> 30,
+    5 -> 7, 0 -> 1. None when already expired or further out.
+    """
+    if days_left < 0:
+        return None
+    within = [d for d in REMINDER_DAYS if d >= days_left]
+    return min(within) if within else None
+
+
+def reminder_message(title: str, expires_on: date, days_left: int) -> str:
+    name = title or "Your document"
+    if days_left == 0:
+        return f"{name} expires today ({expires_on:%d %b %Y})"
+    return f"{name} expires in {days_left} day{'s' if days_left != 1 else ''} ({expires_on:%d %b %Y})"
+
+
+def _insert_ignore(db: Session, rows: list) -> int:
+    """
+    Bulk INSERT ... ON CONFLICT DO NOTHING in the engine's own dialect.
+    Returns the number of rows actually inserted.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return db.execute(insert(Notification.__table__).on_conflict_do_nothing(), rows).rowcount
+
+
+def run_reminders(db: Session, today: date = None, batch_size: int = 1000) -> dict:
+    """
+    One scheduler pass: emit a notification for every document expiring
+    within REMINDER_DAYS that hasn't had one for its current threshold.
+    Walks the window in keyset batches of (expiry_on, id).
+    """
+    today = today or date.today()
+    until = today + timedelta(days=max(REMINDER_DAYS))
+    now = datetime.utcnow()
+
+    scanned = emitted = 0
+    after = None
+    while True:
+        query = (
+            select(Document.id, Document.user_id, Document.title, Document.expiry_on)
+            .where(Document.expiry_on >= today, Document.expiry_on <= until)
+            .order_by(Document.expiry_on, Document.id)
+            .limit(batch_size)
+        )
+        if after is not None:
+            query = query.where(tuple_(Document.expiry_on, Document.id) > tuple_(*after))
+
+        docs = db.execute(query).all()
+        if not docs:
+            break
+        after = (docs[-1].expiry_on, docs[-1].id)
+        scanned += len(docs)
+
+        rows = []
+        for doc in docs:
+            days_left = (doc.expiry_on - today).days
+            threshold = reminder_threshold(days_left)
+            if threshold is None or doc.user_id is None:
+                continue
+            rows.append({
+                "user_id": doc.user_id,
+                "document_id": doc.id,
+                "kind": KIND,
+                "days_before": threshold,
+                "message": reminder_message(doc.title, doc.expiry_on, days_left),
+                "created_at": now,
+            })
+
+        if rows:
+            emitted += _insert_ignore(db, rows)
+        db.commit()
+
+    return {"scanned": scanned, "emitted": emitted}
+
+
+def backfill_expiry_on(db: Session, batch_size: int = 1000) -> int:
+    """
+    Fill expiry_on for documents OCR'd before the column existed, from
+    the stored expiry_text (falling back to the OCR text), by id batches.
+    """
+    updated = 0
+    after_id = 0
+    while True:
+        docs = db.execute(
+            select(Document.id, Document.expiry_text, Document.ocr_text)
+            .where(Document.id > after_id, Document.expiry_on.is_(None), Document.status == "done")
+            .order_by(Document.id)
+            .limit(batch_size)
+        ).all()
+        if not docs:
+            break
+        after_id = docs[-1].id
+
+        for doc in docs:
+            expiry = extract_expiry(doc.expiry_text or "") or extract_expiry(doc.ocr_text or "")
+            if expiry:
+                db.execute(
+                    Document.__table__.update()
+                    .where(Document.id == doc.id)
+                    .values(expiry_on=date.fromisoformat(expiry.iso))
+                )
+                updated += 1
+        db.commit()
+    return updated
+
+
+def main():
+    from app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--every", type=float, help="repeat every N seconds")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--backfill", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.backfill:
+            print(f"✅ expiry_on filled for {backfill_expiry_on(db, args.batch_size)} documents")
+            return
+
+        while True:
+            start = time.perf_counter()
+            stats = run_reminders(db, batch_size=args.batch_size)
+            print(
+                f"✅ Reminders: {stats['scanned']} expiring documents scanned, "
+                f"{stats['emitted']} notifications in {time.perf_counter() - start:.2f} s"
+            )
+            if not args.every:
+                break
+            time.sleep(args.every)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# app/services/expiry_roi.py
+import re
+
+import cv2
+
+from app.services.date_extract import extract_expiry
+
+# Words that label the validity/expiry date on RC/PUC/insurance/DL scans
+_KEYWORD = re.compile(r"(?:valid\w*|expir\w*|exp|upto|till)", re.IGNORECASE)
+
+# Region read around a keyword, in keyword heights: a little to its left,
+# all the way to the right edge, and the line below it (dates printed
+# under their label)
+_REGION_LEFT = 2
+_REGION_ABOVE = 1
+_REGION_BELOW = 3
+
+
+def is_expiry_keyword(word: str) -> bool:
+    return _KEYWORD.fullmatch(word.strip(" .:,;-")) is not None
+
+
+def merge_regions(regions):
+    """Union overlapping (x0, y0, x1, y1) boxes until none overlap."""
+    merged = []
+    for box in sorted(regions):
+        for i, other in enumerate(merged):
+            if box[0] <= other[2] and other[0] <= box[2] and box[1] <= other[3] and other[1] <= box[3]:
+                merged[i] = (min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3]))
+                break
+        else:
+            merged.append(box)
+    if len(merged) < len(regions):
+        return merge_regions(merged)
+    return merged
+
+
+def keyword_regions(words, shape, scale=1.0):
+    """
+    Regions of the full-size image (shape) around every expiry keyword in
+    words, whose boxes are in a copy scaled by scale.
+    """
+    h, w = shape[:2]
+    regions = []
+    for word in words:
+        if not is_expiry_keyword(word.text):
+            continue
+        left, top = word.left / scale, word.top / scale
+        height = word.height / scale
+        regions.append((
+            max(int(left - _REGION_LEFT * height), 0),
+            max(int(top - _REGION_ABOVE * height), 0),
+            w,
+            min(int(top + (1 + _REGION_BELOW) * height), h),
+        ))
+    return merge_regions(regions)
+
+
+def ocr_expiry_regions(img, engine, coarse_scale=0.5):
+    """
+    Two-pass expiry OCR of a preprocessed page: word boxes from a
+    coarse_scale copy locate the expiry keywords, then only the regions
+    around them are OCR'd at full resolution. Returns the regions' text
+    (top to bottom), or None when no keyword was found or the regions
+    hold no date: the caller then OCRs the whole page.
+    """
+    coarse = img
+    if coarse_scale < 1.0:
+        coarse = cv2.resize(img, None, fx=coarse_scale, fy=coarse_scale, interpolation=cv2.INTER_AREA)
+
+    regions = keyword_regions(engine.image_to_data(coarse), img.shape, coarse_scale)
+    if not regions:
+        return None
+
+    text = "\n".join(
+        engine.image_to_string(img[y0:y1, x0:x1])
+        for x0, y0, x1, y1 in sorted(regions, key=lambda r: (r[1], r[0]))
+    )
+    if extract_expiry(text) is None:
+        return None
+    return text
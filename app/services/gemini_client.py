@@ -1,13 +1,31 @@
 # app/services/gemini_client.py
-import json
-import requests
+import threading
 
 from app.core.config import settings
-
-GEMINI_ENDPOINT = (
-    "https://generativelanguage.googleapis.com/v1beta/"
-    "models/gemini-1.5-flash:generateContent"
-)
+from app.services.llm_client import AsyncGeminiClient, GeminiClient
+
+# Built once per process, on first use: every call reuses the same
+# pooled connection
+_client = None
+_async_client = None
+_clients_lock = threading.Lock()
+
+
+def _get_clients():
+    global _client, _async_client
+    if _client is None:
+        with _clients_lock:
+            if _client is None:
+                options = dict(
+                    api_key=settings.GEMINI_API_KEY,
+                    model=settings.GEMINI_MODEL,
+                    base_url=settings.GEMINI_BASE_URL,
+                    timeout=settings.GEMINI_TIMEOUT,
+                    max_retries=settings.GEMINI_MAX_RETRIES,
+                )
+                _async_client = AsyncGeminiClient(**options)
+                _client = GeminiClient(**options)
+    return _client, _async_client
 
 
 def ask_gemini(prompt: str) -> str:
@@ -15,28 +33,20 @@ def ask_gemini(prompt: str) -> str:
     Call Gemini with a simple text prompt and return the generated text.
     Raises RuntimeError if anything goes wrong.
     """
-    params = {"key": settings.GEMINI_API_KEY}
-    body = {
-        "contents": [
-            {
-                "parts": [
-                    {"text": prompt}
-                ]
-            }
-        ]
-    }
-
-    resp = requests.post(GEMINI_ENDPOINT, params=params, json=body, timeout=40)
-
-    if not resp.ok:
-        raise RuntimeError(f"Gemini error {resp.status_code}: {resp.text}")
-
-    data = resp.json()
-
-    try:
-        return data["candidates"][0]["content"]["parts"][0]["text"]
-    except Exception:
-        # In case Google changes the schema a bit
-        raise RuntimeError(
-            "Unexpected Gemini response: " + json.dumps(data)[:500]
-        )
+    return _get_clients()[0].generate_text(prompt)
+
+
+async def ask_gemini_async(prompt: str) -> str:
+    """
+    Same as ask_gemini, but awaits the HTTP call instead of blocking a
+    threadpool worker for the whole generation time.
+    """
+    return await _get_clients()[1].generate_text(prompt)
+
+
+def stream_gemini_async(prompt: str):
+    """
+    Async generator of text chunks as Gemini produces them
+    (streamGenerateContent), for responses that render incrementally.
+    """
+    return _get_clients()[1].stream_text(prompt)
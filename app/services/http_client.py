@@ -0,0 +1,153 @@
+# app/services/http_client.py
+import os
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class DownloadTooLarge(Exception):
+    """Raised when a response body exceeds the configured size cap."""
+
+
+class HttpClient:
+    """
+    Shared keep-alive HTTP client for fetching document images.
+
+    - one requests.Session with a bounded connection pool per host
+    - connect/read timeouts and a couple of retries on 5xx
+    - bodies are streamed into a buffer and aborted past max_bytes
+    - ETag / Last-Modified are remembered per URL so an unchanged object
+      comes back as a 304 and is served from memory
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        max_bytes: int = 20 * 1024 * 1024,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 15,
+        validator_cache_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        # pool_block keeps us at pool_maxsize connections per host
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # url -> (etag, last_modified, body), bounded by total body size
+        self._validators = OrderedDict()
+        self._validator_bytes = 0
+        self._validator_max_bytes = validator_cache_bytes
+        self._lock = threading.Lock()
+
+    def _conditional_headers(self, url):
+        with self._lock:
+            entry = self._validators.get(url)
+            if entry is None:
+                return {}, None
+            self._validators.move_to_end(url)
+
+        etag, last_modified, body = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers, body
+
+    def _remember(self, url, etag, last_modified, body):
+        if not (etag or last_modified) or len(body) > self._validator_max_bytes:
+            return
+
+        with self._lock:
+            old = self._validators.pop(url, None)
+            if old is not None:
+                self._validator_bytes -= len(old[2])
+
+            self._validators[url] = (etag, last_modified, body)
+            self._validator_bytes += len(body)
+
+            while self._validator_bytes > self._validator_max_bytes:
+                _, evicted = self._validators.popitem(last=False)
+                self._validator_bytes -= len(evicted[2])
+
+    def fetch(self, url: str) -> bytes:
+        """
+        GET url and return the body. Raises requests.HTTPError on a bad
+        status and DownloadTooLarge if the body is bigger than max_bytes.
+        """
+        headers, cached_body = self._conditional_headers(url)
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as resp:
+            if resp.status_code == 304 and cached_body is not None:
+                return cached_body
+
+            resp.raise_for_status()
+
+            length = resp.headers.get("Content-Length")
+            if length is not None and int(length) > self.max_bytes:
+                raise DownloadTooLarge(f"{length} bytes exceeds limit of {self.max_bytes}")
+
+            buf = bytearray()
+            for chunk in resp.iter_content(self.CHUNK_SIZE):
+                buf += chunk
+                if len(buf) > self.max_bytes:
+                    raise DownloadTooLarge(f"Body exceeds limit of {self.max_bytes} bytes")
+
+            body = bytes(buf)
+            self._remember(
+                url,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+                body,
+            )
+            return body
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Process-wide client configured from the environment:
+      HTTP_MAX_DOWNLOAD_BYTES      (default 20 MB)
+      HTTP_POOL_MAXSIZE            (default 10 connections per host)
+      HTTP_CONNECT_TIMEOUT         (default 5 s)
+      HTTP_READ_TIMEOUT            (default 15 s)
+      HTTP_CONDITIONAL_CACHE_BYTES (default 64 MB, 0 disables)
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(
+                    max_bytes=int(os.environ.get("HTTP_MAX_DOWNLOAD_BYTES", 20 * 1024 * 1024)),
+                    pool_maxsize=int(os.environ.get("HTTP_POOL_MAXSIZE", 10)),
+                    connect_timeout=float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5)),
+                    read_timeout=float(os.environ.get("HTTP_READ_TIMEOUT", 15)),
+                    validator_cache_bytes=int(
+                        os.environ.get("HTTP_CONDITIONAL_CACHE_BYTES", 64 * 1024 * 1024)
+                    ),
+                )
+    return _client
@@ -0,0 +1,85 @@
+# app/services/itinerary.py
+import re
+
+_DAY = re.compile(r"\bday\s*(\d+)", re.IGNORECASE)
+
+
+def convert_ai_to_itinerary(text: str):
+    """
+    Convert Gemini plain text into a list of itinerary items.
+    Expects lines like:
+      - Day 1 - Visit ...
+      - Day 2 - ...
+    """
+    lines = text.split("\n")
+    items = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if "-" in line:
+            title, detail = line.split("-", 1)
+        else:
+            title, detail = line, ""
+
+        items.append(
+            {
+                "title": title.strip(" -*\t"),
+                "detail": detail.strip(),
+                "eta": "Flexible",
+            }
+        )
+    return items
+
+
+def itinerary_item_rows(trip_id: int, items: list) -> list:
+    """
+    itinerary_items rows for a parsed itinerary: ordinal keeps the
+    original order, day is the latest "Day N" seen so far (None before
+    the first one).
+    """
+    rows = []
+    day = None
+    for ordinal, item in enumerate(items):
+        match = _DAY.search(item["title"] + " " + item["detail"])
+        if match:
+            day = int(match.group(1))
+        rows.append(
+            {
+                "trip_id": trip_id,
+                "day": day,
+                "ordinal": ordinal,
+                "title": item["title"],
+                "detail": item["detail"],
+                "eta": item["eta"],
+            }
+        )
+    return rows
+
+
+class ItineraryStreamParser:
+    """
+    Incremental convert_ai_to_itinerary for streamed text: feed() chunks
+    as they arrive and get back the items of every line completed so far;
+    close() flushes the last, unterminated line.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._chunks = []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far (the full response once the stream ends)."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str):
+        self._chunks.append(chunk)
+        *lines, self._pending = (self._pending + chunk).split("\n")
+        return convert_ai_to_itinerary("\n".join(lines)) if lines else []
+
+    def close(self):
+        rest, self._pending = self._pending, ""
+        return convert_ai_to_itinerary(rest)
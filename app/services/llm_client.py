@@ -0,0 +1,294 @@
+# app/services/llm_client.py
+import base64
+import json
+import random
+import threading
+import asyncio
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# Worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GeminiError(RuntimeError):
+    """Gemini call failed (bad status, unexpected schema, or retries exhausted)."""
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_maxsize: int = 10) -> requests.Session:
+    """
+    Keep-alive session shared by every GeminiClient in the process, so
+    the TLS connection to the Gemini endpoint is reused across calls.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class _GeminiBase:
+    """
+    Request building, retry policy and response parsing shared by the
+    sync and async clients.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-1.5-flash",
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 40,
+        connect_timeout: float = 5,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.api_key = api_key
+        # Accept both "gemini-1.5-flash" and "models/gemini-1.5-flash"
+        self.model = model.split("/", 1)[1] if model.startswith("models/") else model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _url(self, method: str) -> str:
+        return f"{self.base_url}/models/{self.model}:{method}"
+
+    def _retry_delay(self, attempt: int) -> float:
+        # Full jitter: spread retries from many workers instead of
+        # having them hit the API again in lockstep
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    @staticmethod
+    def _body(parts: list) -> dict:
+        return {"contents": [{"parts": parts}]}
+
+    @staticmethod
+    def _text_parts(prompt: str) -> list:
+        return [{"text": prompt}]
+
+    @staticmethod
+    def _image_parts(prompt: str, image_bytes: bytes, mime_type: str) -> list:
+        return [
+            {"text": prompt},
+            {
+                "inline_data": {
+                    "mime_type": mime_type,
+                    "data": base64.b64encode(image_bytes).decode("utf-8"),
+                }
+            },
+        ]
+
+    def _params(self, stream: bool) -> dict:
+        params = {"key": self.api_key}
+        if stream:
+            params["alt"] = "sse"  # streamGenerateContent as Server-Sent Events
+        return params
+
+    @staticmethod
+    def _sse_data(line: str):
+        """JSON payload of an SSE "data:" line, None for anything else."""
+        if not line.startswith("data:"):
+            return None
+        return json.loads(line[5:].strip())
+
+    @staticmethod
+    def _chunk_text(data: dict) -> str:
+        """Text of one streamed chunk; chunks without parts (e.g. the final
+        finishReason-only one) carry no text."""
+        if "error" in data:
+            raise GeminiError("Gemini stream error: " + json.dumps(data["error"])[:500])
+        candidates = data.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+    @staticmethod
+    def _text_from(data: dict) -> str:
+        try:
+            parts = data["candidates"][0]["content"]["parts"]
+            return "".join(part.get("text", "") for part in parts)
+        except Exception:
+            # In case Google changes the schema a bit
+            raise GeminiError("Unexpected Gemini response: " + json.dumps(data)[:500])
+
+
+class GeminiClient(_GeminiBase):
+    """
+    Thin REST client for one Gemini model. Create it once at module level
+    and reuse it; all instances share one pooled session.
+    """
+
+    def __init__(self, *args, session: requests.Session = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = session or get_session()
+
+    def _post(self, method: str, body: dict, stream: bool = False) -> requests.Response:
+        params = self._params(stream)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._retry_delay(attempt - 1))
+
+            try:
+                resp = self.session.post(
+                    self._url(method),
+                    params=params,
+                    json=body,
+                    timeout=(self.connect_timeout, self.timeout),
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = GeminiError(f"Gemini request failed: {e}")
+                continue
+
+            if resp.status_code in RETRY_STATUSES:
+                last_error = GeminiError(f"Gemini error {resp.status_code}: {resp.text}")
+                resp.close()
+                continue
+
+            if not resp.ok:
+                raise GeminiError(f"Gemini error {resp.status_code}: {resp.text}")
+
+            return resp
+
+        raise last_error
+
+    def generate(self, parts: list) -> str:
+        """
+        Call generateContent with a list of parts and return the text.
+        """
+        resp = self._post("generateContent", self._body(parts))
+        return self._text_from(resp.json())
+
+    def generate_text(self, prompt: str) -> str:
+        return self.generate(self._text_parts(prompt))
+
+    def generate_from_image(self, prompt: str, image_bytes: bytes, mime_type: str = "image/jpeg") -> str:
+        return self.generate(self._image_parts(prompt, image_bytes, mime_type))
+
+    def stream_generate(self, parts: list):
+        """
+        Call streamGenerateContent and yield text chunks as they arrive.
+        Retries only happen before the first chunk.
+        """
+        resp = self._post("streamGenerateContent", self._body(parts), stream=True)
+        with resp:
+            resp.encoding = "utf-8"
+            for line in resp.iter_lines(decode_unicode=True):
+                data = self._sse_data(line or "")
+                if data is not None:
+                    text = self._chunk_text(data)
+                    if text:
+                        yield text
+
+    def stream_text(self, prompt: str):
+        return self.stream_generate(self._text_parts(prompt))
+
+
+class AsyncGeminiClient(_GeminiBase):
+    """
+    asyncio flavour of GeminiClient on httpx.AsyncClient, so FastAPI
+    handlers can await Gemini without holding a threadpool worker.
+    The httpx client is created on first use, inside the running loop;
+    httpx itself is only imported then, so the sync Flask backends don't
+    need it.
+    """
+
+    def __init__(self, *args, pool_maxsize: int = 100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_maxsize = pool_maxsize
+        self._client = None
+
+    def _http(self) -> "httpx.AsyncClient":
+        import httpx
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, method: str, body: dict, stream: bool = False) -> "httpx.Response":
+        import httpx
+
+        params = self._params(stream)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._retry_delay(attempt - 1))
+
+            client = self._http()
+            request = client.build_request("POST", self._url(method), params=params, json=body)
+            try:
+                resp = await client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                last_error = GeminiError(f"Gemini request failed: {e}")
+                continue
+
+            if resp.status_code in RETRY_STATUSES or not resp.is_success:
+                await resp.aread()
+                await resp.aclose()
+                error = GeminiError(f"Gemini error {resp.status_code}: {resp.text}")
+                if resp.status_code not in RETRY_STATUSES:
+                    raise error
+                last_error = error
+                continue
+
+            return resp
+
+        raise last_error
+
+    async def generate(self, parts: list) -> str:
+        resp = await self._post("generateContent", self._body(parts))
+        return self._text_from(resp.json())
+
+    async def generate_text(self, prompt: str) -> str:
+        return await self.generate(self._text_parts(prompt))
+
+    async def generate_from_image(self, prompt: str, image_bytes: bytes, mime_type: str = "image/jpeg") -> str:
+        return await self.generate(self._image_parts(prompt, image_bytes, mime_type))
+
+    async def stream_generate(self, parts: list):
+        """
+        Async generator of text chunks from streamGenerateContent.
+        Retries only happen before the first chunk.
+        """
+        resp = await self._post("streamGenerateContent", self._body(parts), stream=True)
+        try:
+            async for line in resp.aiter_lines():
+                data = self._sse_data(line)
+                if data is not None:
+                    text = self._chunk_text(data)
+                    if text:
+                        yield text
+        finally:
+            await resp.aclose()
+
+    def stream_text(self, prompt: str):
+        return self.stream_generate(self._text_parts(prompt))
@@ -0,0 +1,214 @@
+# app/services/ocr_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def make_cache_key(img_bytes: bytes, preprocess_params: dict, ocr_config: str) -> str:
+    """
+    Content-addressed key: SHA-256 of the image bytes plus everything that
+    can change the OCR output (preprocessing parameters, Tesseract config).
+    """
+    h = hashlib.sha256()
+    h.update(hashlib.sha256(img_bytes).digest())
+    h.update(json.dumps(preprocess_params, sort_keys=True).encode("utf-8"))
+    h.update(ocr_config.encode("utf-8"))
+    return h.hexdigest()
+
+
+class MemoryTier:
+    """
+    LRU of key -> OCR text, bounded by the total size of the stored text.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            text = self._items.get(key)
+            if text is not None:
+                self._items.move_to_end(key)
+            return text
+
+    def put(self, key, text):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old.encode("utf-8"))
+
+            self._items[key] = text
+            self._size += size
+
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted.encode("utf-8"))
+
+
+class SqliteTier:
+    """
+    On-disk tier in its own SQLite file (a disposable cache, not part of
+    the app schema). Rows are evicted least-recently-used first once the
+    stored text exceeds max_bytes; the running total lives in a one-row
+    table, so puts never scan the cache.
+    """
+
+    # Reads only write last_used back when it is older than this: LRU
+    # order to within a few minutes, and most hits stay read-only
+    TOUCH_INTERVAL = 300
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_cache ("
+                " cache_key TEXT PRIMARY KEY,"
+                " ocr_text TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_ocr_cache_last_used"
+                " ON ocr_cache (last_used)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_cache_size ("
+                " id INTEGER PRIMARY KEY CHECK (id = 1),"
+                " total INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO ocr_cache_size (id, total)"
+                " SELECT 1, COALESCE(SUM(size), 0) FROM ocr_cache"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT ocr_text, last_used FROM ocr_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            text, last_used = row
+            now = time.time()
+            if now - last_used > self.TOUCH_INTERVAL:
+                conn.execute(
+                    "UPDATE ocr_cache SET last_used = ? WHERE cache_key = ?",
+                    (now, key),
+                )
+            return text
+
+    def put(self, key, text):
+        size = len(text.encode("utf-8"))
+
+        with self._connect() as conn:
+            old = conn.execute(
+                "SELECT size FROM ocr_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache"
+                " (cache_key, ocr_text, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time()),
+            )
+            total = self._add_to_total(conn, size - (old[0] if old else 0))
+
+            # Walk from the least recently used end until back under budget
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                stale, freed = [], 0
+                for stale_key, stale_size in conn.execute(
+                    "SELECT cache_key, size FROM ocr_cache ORDER BY last_used"
+                ):
+                    stale.append((stale_key,))
+                    freed += stale_size
+                    if freed >= excess:
+                        break
+                conn.executemany("DELETE FROM ocr_cache WHERE cache_key = ?", stale)
+                self._add_to_total(conn, -freed)
+
+    @staticmethod
+    def _add_to_total(conn, delta):
+        conn.execute("UPDATE ocr_cache_size SET total = total + ? WHERE id = 1", (delta,))
+        return conn.execute("SELECT total FROM ocr_cache_size WHERE id = 1").fetchone()[0]
+
+
+class OcrCache:
+    """
+    Two-tier OCR result cache: in-memory LRU in front of SQLite.
+    """
+
+    def __init__(self, memory: MemoryTier, disk: SqliteTier = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        if self.disk is not None:
+            text = self.disk.get(key)
+            if text is not None:
+                self.memory.put(key, text)
+
+        return text
+
+    def put(self, key, text):
+        self.memory.put(key, text)
+        if self.disk is not None:
+            self.disk.put(key, text)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_ocr_cache() -> OcrCache:
+    """
+    Process-wide cache configured from the environment:
+      OCR_CACHE_MEMORY_MAX_BYTES  (default 32 MB)
+      OCR_CACHE_DB                (default ocr_cache.db, "" disables disk)
+      OCR_CACHE_DISK_MAX_BYTES    (default 256 MB)
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                memory = MemoryTier(
+                    int(os.environ.get("OCR_CACHE_MEMORY_MAX_BYTES", 32 * 1024 * 1024))
+                )
+
+                disk = None
+                db_path = os.environ.get("OCR_CACHE_DB", "ocr_cache.db")
+                if db_path:
+                    disk = SqliteTier(
+                        db_path,
+                        int(os.environ.get("OCR_CACHE_DISK_MAX_BYTES", 256 * 1024 * 1024)),
+                    )
+
+                _cache = OcrCache(memory, disk)
+    return _cache
@@ -0,0 +1,217 @@
+# app/services/ocr_engine.py
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+try:
+    import tesserocr
+except ImportError:  # libtesseract bindings are optional
+    tesserocr = None
+
+
+# Same settings the OCR backend has always used:
+# --oem 3 (default LSTM engine), --psm 11 (sparse text), eng, 300 dpi
+DEFAULT_LANG = "eng"
+DEFAULT_OEM = 3
+DEFAULT_PSM = 11
+DEFAULT_DPI = 300
+
+# One recognised word and its bounding box, in image pixels
+OcrWord = namedtuple("OcrWord", "text left top width height conf")
+
+
+class OcrEngine(ABC):
+    """
+    Base class for OCR engines. Subclasses implement image_to_string()
+    and image_to_data() (words with their boxes) for a grayscale (or RGB)
+    numpy image; one missing either can't be constructed.
+    """
+
+    name = "base"
+
+    def __init__(self, lang=DEFAULT_LANG, oem=DEFAULT_OEM, psm=DEFAULT_PSM, dpi=DEFAULT_DPI):
+        self.lang = lang
+        self.oem = oem
+        self.psm = psm
+        self.dpi = dpi
+
+    @property
+    def config(self) -> str:
+        """Tesseract CLI-style config string, also used as a cache key part."""
+        return f"--oem {self.oem} --psm {self.psm} -l {self.lang} --dpi {self.dpi}"
+
+    def warm(self):
+        """Load models ahead of the first request (no-op by default)."""
+
+    @abstractmethod
+    def image_to_string(self, img) -> str:
+        ...
+
+    @abstractmethod
+    def image_to_data(self, img) -> list:
+        ...
+
+
+class PytesseractEngine(OcrEngine):
+    """
+    Runs the tesseract CLI through pytesseract. Every call forks the
+    binary and reloads the traineddata, so it is the slow fallback.
+    """
+
+    name = "pytesseract"
+
+    def image_to_string(self, img) -> str:
+        return pytesseract.image_to_string(img, config=self.config)
+
+    def image_to_data(self, img) -> list:
+        data = pytesseract.image_to_data(img, config=self.config, output_type=pytesseract.Output.DICT)
+        return [
+            OcrWord(text, left, top, width, height, float(conf))
+            for text, left, top, width, height, conf in zip(
+                data["text"], data["left"], data["top"], data["width"], data["height"], data["conf"]
+            )
+            if text.strip()
+        ]
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    Keeps warm libtesseract handles (via tesserocr) so the model is
+    loaded once per handle instead of once per image.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, *args, max_handles=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # PyTessBaseAPI is not thread-safe: each call checks a handle out
+        # of this pool and back in. Not per thread: the Flask server starts
+        # a new thread for every request, which would reload the model
+        # every time. At most max_handles are built; beyond that callers
+        # wait for a free one.
+        self.max_handles = max_handles or int(os.environ.get("OCR_ENGINE_HANDLES", os.cpu_count() or 1))
+        self._handles = queue.Queue()
+        self._created = 0
+        self._created_lock = threading.Lock()
+
+    def _new_api(self):
+        api = tesserocr.PyTessBaseAPI(
+            lang=self.lang,
+            oem=self.oem,
+            psm=self.psm,
+        )
+        api.SetVariable("user_defined_dpi", str(self.dpi))
+        return api
+
+    @contextmanager
+    def _api(self):
+        try:
+            api = self._handles.get_nowait()
+        except queue.Empty:
+            with self._created_lock:
+                create = self._created < self.max_handles
+                self._created += create
+            if create:
+                try:
+                    api = self._new_api()
+                except Exception:
+                    with self._created_lock:
+                        self._created -= 1
+                    raise
+            else:
+                api = self._handles.get()
+        try:
+            yield api
+        finally:
+            self._handles.put(api)
+
+    def warm(self):
+        with self._api():
+            pass
+
+    @staticmethod
+    def _set_image(api, img):
+        if isinstance(img, np.ndarray) and img.ndim == 2:
+            # Hand the raw 8-bit buffer over without a PIL round-trip
+            img = np.ascontiguousarray(img, dtype=np.uint8)
+            h, w = img.shape
+            api.SetImageBytes(img.tobytes(), w, h, 1, w)
+        else:
+            if isinstance(img, np.ndarray):
+                img = Image.fromarray(img)
+            api.SetImage(img)
+
+    def image_to_string(self, img) -> str:
+        with self._api() as api:
+            self._set_image(api, img)
+            return api.GetUTF8Text()
+
+    def image_to_data(self, img) -> list:
+        words = []
+        with self._api() as api:
+            self._set_image(api, img)
+            api.Recognize()
+
+            iterator = api.GetIterator()
+            if iterator is None:
+                return words
+
+            level = tesserocr.RIL.WORD
+            for word in tesserocr.iterate_level(iterator, level):
+                text = word.GetUTF8Text(level)
+                box = word.BoundingBox(level)
+                if not text or not text.strip() or box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                words.append(OcrWord(text, x1, y1, x2 - x1, y2 - y1, word.Confidence(level)))
+        return words
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_engine(kind: str = "auto", **kwargs) -> OcrEngine:
+    """
+    Build an engine. kind is "tesserocr", "pytesseract" or "auto"
+    (tesserocr when the bindings are installed, pytesseract otherwise).
+    """
+    if kind == "auto":
+        kind = "tesserocr" if tesserocr is not None else "pytesseract"
+
+    if kind == "tesserocr":
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        return TesserocrEngine(**kwargs)
+
+    if kind == "pytesseract":
+        return PytesseractEngine(**kwargs)
+
+    raise ValueError(f"Unknown OCR engine: {kind}")
+
+
+def get_engine() -> OcrEngine:
+    """
+    Process-wide engine, chosen by the OCR_ENGINE env var (default "auto").
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(os.environ.get("OCR_ENGINE", "auto"))
+    return _engine
+
+
+def warm_engine():
+    """
+    Initializer for OCR worker processes/threads: build the engine and
+    load the traineddata before the first document arrives.
+    """
+    get_engine().warm()
@@ -0,0 +1,148 @@
+# app/services/ocr_jobs.py
+import queue
+import threading
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import or_, update
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Document
+from app.services.date_extract import extract_expiry
+
+
+def process_document(doc_id: int):
+    """
+    OCR one uploaded document and store the text and printed expiry date
+    on its row. Runs on an OcrJobQueue worker thread. Several workers
+    may hold the same id (startup requeue, scale-out): only the one
+    that claims the queued row OCRs it.
+    """
+    # Imported here so the API process only loads PIL/Tesseract once a
+    # document actually needs OCR
+    from app.services.ocr_service import run_ocr
+
+    db = SessionLocal()
+    try:
+        claimed = db.execute(
+            update(Document)
+            .where(Document.id == doc_id, Document.status == "queued")
+            .values(status="processing", claimed_at=datetime.utcnow())
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        doc = db.get(Document, doc_id)
+
+        try:
+            text = run_ocr(doc.file_path)
+            expiry = extract_expiry(text)
+        except Exception as e:
+            doc.status = "failed"
+            doc.error = str(e)
+        else:
+            doc.ocr_text = text
+            doc.expiry_text = expiry.text if expiry else None
+            doc.expiry_on = date.fromisoformat(expiry.iso) if expiry else None
+            doc.status = "done"
+        db.commit()
+    finally:
+        db.close()
+
+
+class OcrJobQueue:
+    """
+    Bounded queue of document ids drained by a fixed pool of worker
+    threads (Tesseract releases the GIL). submit() never blocks: a full
+    queue is reported to the caller so the API can answer 429.
+    """
+
+    def __init__(self, workers: int, max_pending: int, handler=process_document):
+        self.workers = workers
+        self.handler = handler
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"ocr-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, doc_id: int) -> bool:
+        self.start()
+        try:
+            self._queue.put_nowait(doc_id)
+        except queue.Full:
+            return False
+        return True
+
+    def is_full(self) -> bool:
+        return self._queue.full()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            doc_id = self._queue.get()
+            try:
+                self.handler(doc_id)
+            except Exception as e:
+                print(f"⚠️ OCR job for document {doc_id} failed:", e)
+            finally:
+                self._queue.task_done()
+
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_ocr_job_queue() -> OcrJobQueue:
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                _jobs = OcrJobQueue(settings.OCR_JOB_WORKERS, settings.OCR_JOB_QUEUE_SIZE)
+    return _jobs
+
+
+def requeue_unfinished() -> int:
+    """
+    Re-submit queued documents (up to the queue's capacity), after
+    putting back the ones whose "processing" claim is older than
+    OCR_JOB_STALE_SECONDS: their worker died. Called once at startup.
+    Ids another live worker still has queued are submitted too, but the
+    claim in process_document lets only one of them run the OCR.
+    """
+    jobs = get_ocr_job_queue()
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.OCR_JOB_STALE_SECONDS)
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Document)
+            .where(
+                Document.status == "processing",
+                or_(Document.claimed_at.is_(None), Document.claimed_at < cutoff),
+            )
+            .values(status="queued", claimed_at=None)
+        )
+        db.commit()
+        doc_ids = [
+            doc_id for (doc_id,) in db.query(Document.id)
+            .filter(Document.status == "queued")
+            .order_by(Document.id)
+        ]
+    finally:
+        db.close()
+
+    submitted = 0
+    for doc_id in doc_ids:
+        if not jobs.submit(doc_id):
+            break
+        submitted += 1
+    return submitted
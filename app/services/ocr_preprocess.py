@@ -0,0 +1,211 @@
+# app/services/ocr_preprocess.py
+# Decode + clean-up of document photos before OCR, shared by the Flask
+# OCR backend and the FastAPI document jobs.
+from io import BytesIO
+
+import cv2
+import numpy as np
+from PIL import Image, ImageOps
+
+
+# Part of the OCR cache key: change these and cached text is ignored
+PREPROCESS_PARAMS = {
+    # "adaptive": pick the scale from the estimated text height
+    # "fixed": always resize by "scale" (the old 2.5x behaviour)
+    "scaling": "adaptive",
+    "scale": 2.5,
+    "target_text_height": 30,
+    "min_scale": 0.3,
+    "max_scale": 4.0,
+    # Used when there is too little text to measure
+    "fallback_long_side": 3200,
+    "median_blur": 3,
+    # Decode at 1/1, 1/2, 1/4 or 1/8 resolution (JPEG DCT scaling);
+    # only worth it for very large photos with large text
+    "decode_reduce": 1,
+    # Try QR codes/barcodes first; a validity date found there skips OCR
+    "code_fastpath": True,
+    # Crop to the card/page outline (perspective-corrected) before OCR
+    "doc_crop": True,
+    # ...when it covers at least this share of the frame
+    "doc_min_area": 0.15,
+    # mode=expiry_fast: scale of the keyword-finding pass
+    "expiry_fast_scale": 0.5,
+    # Pages taller than 1.5 tiles are OCR'd as bands of about this
+    # height, each reaching tile_overlap px into its neighbours (0: off)
+    "tile_height": 1200,
+    "tile_overlap": 80,
+}
+
+# Longest side of the low-res proxy used to measure text height
+TEXT_PROBE_SIDE = 1200
+
+# Longest side of the low-res proxy the document outline is searched on
+CROP_PROBE_SIDE = 800
+
+
+def estimate_text_height(gray):
+    """
+    Median glyph height in pixels of the full-size image, measured on a
+    downscaled proxy. Returns None when too few glyph-like blobs are found.
+    """
+    h, w = gray.shape[:2]
+    probe_scale = min(1.0, TEXT_PROBE_SIDE / max(h, w))
+    probe = gray
+    if probe_scale < 1.0:
+        probe = cv2.resize(gray, None, fx=probe_scale, fy=probe_scale, interpolation=cv2.INTER_AREA)
+
+    # Dark text on light paper -> white blobs on black
+    binary = cv2.adaptiveThreshold(
+        probe, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 31, 15
+    )
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+
+    # Keep blobs shaped like characters: not specks, not lines or photos
+    glyphs = (
+        (heights >= 3)
+        & (heights <= probe.shape[0] // 10)
+        & (widths <= heights * 3)
+        & (heights <= widths * 6)
+    )
+    if glyphs.sum() < 20:
+        return None
+
+    return float(np.median(heights[glyphs])) / probe_scale
+
+
+def order_corners(pts):
+    """4x2 points -> float32 [top-left, top-right, bottom-right, bottom-left]."""
+    pts = np.asarray(pts, dtype=np.float32).reshape(4, 2)
+    by_sum = pts.sum(axis=1)
+    by_diff = np.diff(pts, axis=1).ravel()  # y - x
+    return np.array([
+        pts[np.argmin(by_sum)],
+        pts[np.argmin(by_diff)],
+        pts[np.argmax(by_sum)],
+        pts[np.argmax(by_diff)],
+    ], dtype=np.float32)
+
+
+def find_document_quad(gray, min_area=PREPROCESS_PARAMS["doc_min_area"]):
+    """
+    Corners of the card/page in full-size coordinates (see order_corners),
+    found as the largest convex four-sided outline on a downscaled proxy.
+    None when there is no such outline covering min_area..90% of the
+    frame: close-up scans and cluttered shots are OCR'd whole.
+    """
+    h, w = gray.shape[:2]
+    probe_scale = min(1.0, CROP_PROBE_SIDE / max(h, w))
+    probe = gray
+    if probe_scale < 1.0:
+        probe = cv2.resize(gray, None, fx=probe_scale, fy=probe_scale, interpolation=cv2.INTER_AREA)
+
+    # Edges of the paper against the background; dilation closes the
+    # small gaps glare and fingers leave in the outline
+    probe = cv2.GaussianBlur(probe, (5, 5), 0)
+    edges = cv2.Canny(probe, 50, 150)
+    edges = cv2.dilate(edges, np.ones((3, 3), np.uint8))
+
+    # All contours, not just outer ones: a card touching another object
+    # merges with it on the outside, but the inner side of its outline
+    # is still a clean quad
+    contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    frame_area = probe.shape[0] * probe.shape[1]
+
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:10]:
+        area = cv2.contourArea(contour)
+        if area < min_area * frame_area:
+            break
+        if area > 0.9 * frame_area:
+            continue
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4 and cv2.isContourConvex(approx):
+            return order_corners(approx / probe_scale)
+    return None
+
+
+def crop_document(gray, quad):
+    """Perspective-correct the quad to an upright rectangle at full resolution."""
+    tl, tr, br, bl = quad
+    width = int(round(max(np.linalg.norm(tr - tl), np.linalg.norm(br - bl))))
+    height = int(round(max(np.linalg.norm(bl - tl), np.linalg.norm(br - tr))))
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(quad, target)
+    return cv2.warpPerspective(gray, matrix, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def choose_scale(gray, params=PREPROCESS_PARAMS):
+    if params["scaling"] == "fixed":
+        return params["scale"]
+
+    text_height = estimate_text_height(gray)
+    if text_height is None:
+        return params["fallback_long_side"] / max(gray.shape[:2])
+
+    scale = params["target_text_height"] / text_height
+    return min(max(scale, params["min_scale"]), params["max_scale"])
+
+
+def preprocess_image(img, params=PREPROCESS_PARAMS):
+
+    # Rotate if image is sideways
+    if img.shape[1] > img.shape[0]:
+        img = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+
+    # Convert to grayscale first: resize a third of the data
+    if img.ndim == 3:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = img
+
+    # Only the card/page goes on: table, seat and dashboard background
+    # would be upscaled and searched for text too
+    if params["doc_crop"]:
+        quad = find_document_quad(gray, params["doc_min_area"])
+        if quad is not None:
+            gray = crop_document(gray, quad)
+
+    # Big phone photos get downscaled, small crops upscaled,
+    # so Tesseract sees ~30px text either way
+    scale = choose_scale(gray, params)
+    if abs(scale - 1.0) > 0.1:
+        gray = cv2.resize(
+            gray, None,
+            fx=scale, fy=scale,
+            interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+        )
+
+    # Light denoising only (NO thresholding)
+    gray = cv2.medianBlur(gray, params["median_blur"])
+
+    return gray
+
+
+_GRAY_DECODE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+
+def decode_gray(img_bytes, reduce=1):
+    """
+    Downloaded bytes -> upright grayscale array in one allocation:
+    libjpeg decodes the luma plane directly (at 1/reduce size), and
+    OpenCV applies the EXIF orientation. Formats OpenCV can't read fall
+    back to PIL.
+    """
+    buf = np.frombuffer(img_bytes, dtype=np.uint8)
+    gray = cv2.imdecode(buf, _GRAY_DECODE_FLAGS[reduce])
+    if gray is not None:
+        return gray
+
+    pil_img = Image.open(BytesIO(img_bytes))
+    if reduce > 1:
+        pil_img.draft("L", (pil_img.width // reduce, pil_img.height // reduce))
+    pil_img = ImageOps.exif_transpose(pil_img).convert("L")
+    return np.asarray(pil_img)
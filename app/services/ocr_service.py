@@ -1,9 +1,14 @@
-import pytesseract
-from PIL import Image
+from app.services.ocr_engine import get_engine
+from app.services.ocr_preprocess import PREPROCESS_PARAMS, decode_gray, preprocess_image
 
-def run_ocr(path: str):
-    try:
-        text = pytesseract.image_to_string(Image.open(path))
-        return text
-    except:
-        return ""
+
+def run_ocr(path: str) -> str:
+    """
+    OCR the image at path, cleaned up as the OCR backend does it: upright
+    grayscale decode, document crop, text-height scaling, light denoise.
+    Errors (unreadable file, no Tesseract) are raised, so the OCR job can
+    mark the document failed.
+    """
+    with open(path, "rb") as f:
+        img = decode_gray(f.read(), PREPROCESS_PARAMS["decode_reduce"])
+    return get_engine().image_to_string(preprocess_image(img))
@@ -0,0 +1,266 @@
+# app/services/token_verifier.py
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+import requests
+from cryptography.x509 import load_pem_x509_certificate
+
+
+# Public certs Google signs Firebase ID tokens with
+FIREBASE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+
+
+class InvalidTokenError(Exception):
+    """The ID token is malformed, expired, or not signed for this project."""
+
+
+def fetch_google_certs():
+    """
+    Download Google's signing certs. Returns ({kid: pem}, max_age_seconds).
+    """
+    resp = requests.get(FIREBASE_CERTS_URL, timeout=10)
+    resp.raise_for_status()
+
+    max_age = 3600
+    match = re.search(r"max-age=(\d+)", resp.headers.get("Cache-Control", ""))
+    if match:
+        max_age = int(match.group(1))
+
+    return resp.json(), max_age
+
+
+class CertCache:
+    """
+    Public keys by key id, refreshed before Google rotates them.
+
+    refresh() loads them up front (pre-warm) and start() keeps them fresh
+    from a daemon thread. Verification only goes to the network for an
+    unknown kid or stale keys, and then at most once per min_refresh:
+    kids come from unauthenticated callers.
+    """
+
+    def __init__(self, fetch=fetch_google_certs, refresh_ratio: float = 0.8, min_refresh: float = 60):
+        self._fetch = fetch
+        self._refresh_ratio = refresh_ratio
+        self._min_refresh = min_refresh
+        self._keys = {}
+        self._expires_at = 0.0
+        self._max_age = 3600
+        self._lock = threading.Lock()
+        self._thread = None
+        self._refresh_lock = threading.Lock()
+        self._last_forced = float("-inf")
+
+    def refresh(self):
+        certs, max_age = self._fetch()
+        keys = {
+            kid: load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+            for kid, pem in certs.items()
+        }
+        with self._lock:
+            self._keys = keys
+            self._max_age = max_age
+            self._expires_at = time.time() + max_age
+
+    def get_key(self, kid: str):
+        if not isinstance(kid, str) or not kid:
+            raise InvalidTokenError("Token has no key id")
+
+        with self._lock:
+            key = self._keys.get(kid)
+            fresh = time.time() < self._expires_at
+
+        if key is None or not fresh:
+            # Rotation we haven't seen yet, or the refresher fell behind
+            self._forced_refresh()
+            with self._lock:
+                key = self._keys.get(kid)
+
+        if key is None:
+            raise InvalidTokenError(f"Unknown signing key id: {kid}")
+        return key
+
+    def _forced_refresh(self):
+        # One fetch at a time and at most one per min_refresh; everyone
+        # else carries on with the keys we have
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            if now - self._last_forced < self._min_refresh:
+                return
+            self._last_forced = now
+            self.refresh()
+        except Exception as e:
+            print("⚠️ Firebase cert refresh failed:", e)
+        finally:
+            self._refresh_lock.release()
+
+    def start(self):
+        """
+        Pre-warm now, then refresh in the background. A failed pre-warm
+        leaves the keys empty: get_key() retries, at most once per
+        min_refresh, instead of every request waiting on the fetch.
+        """
+        if self._thread is not None:
+            return
+        self._forced_refresh()
+        self._thread = threading.Thread(target=self._run, name="firebase-certs", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(max(self._min_refresh, self._max_age * self._refresh_ratio))
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep the old keys; get_key() retries on expiry
+                print("⚠️ Firebase cert refresh failed:", e)
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens (RS256, audience/issuer = project) and
+    caches the decoded claims by token hash until the token's own exp,
+    so repeat requests with the same token skip the RSA check.
+    """
+
+    def __init__(self, project_id: str, certs: CertCache, max_entries: int = 10000, leeway: int = 0):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.certs = certs
+        self.max_entries = max_entries
+        self.leeway = leeway
+
+        self._cache = OrderedDict()  # token hash -> (exp, claims)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.verify_seconds = 0.0
+
+    def _verify_signature(self, token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e))
+
+        if header.get("alg") != "RS256":
+            raise InvalidTokenError("Token must be signed with RS256")
+
+        key = self.certs.get_key(header.get("kid"))
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e))
+
+        sub = claims.get("sub")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise InvalidTokenError("Invalid subject")
+        if claims.get("auth_time", 0) > time.time() + self.leeway:
+            raise InvalidTokenError("auth_time is in the future")
+
+        claims["uid"] = sub
+        return claims
+
+    def verify(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                exp, claims = entry
+                if now < exp:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return dict(claims)
+                del self._cache[key]
+            self.misses += 1
+
+        start = time.perf_counter()
+        try:
+            claims = self._verify_signature(token)
+        except InvalidTokenError:
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.verify_seconds += elapsed
+
+        with self._lock:
+            self._cache[key] = (claims["exp"], claims)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return dict(claims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cached_tokens": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "failures": self.failures,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_verify_ms": self.verify_seconds / self.misses * 1000 if self.misses else 0.0,
+            }
+
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_token_verifier() -> FirebaseTokenVerifier:
+    """
+    Process-wide verifier for the initialised Firebase app's project.
+    Certs are fetched on first use and refreshed in the background; the
+    verifier is created even when that first fetch fails.
+    """
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                from app.core.config import settings
+                from app.core.firebase import get_firebase_app
+
+                project_id = get_firebase_app().project_id
+                if not project_id:
+                    raise RuntimeError("Firebase project id is not configured")
+
+                certs = CertCache()
+                certs.start()
+                _verifier = FirebaseTokenVerifier(
+                    project_id,
+                    certs,
+                    max_entries=settings.FIREBASE_TOKEN_CACHE_SIZE,
+                )
+    return _verifier
+
+
+def token_verifier_stats() -> dict:
+    """stats() of the process-wide verifier, without creating it."""
+    verifier = _verifier
+    if verifier is None:
+        return {"cached_tokens": 0, "hits": 0, "misses": 0, "failures": 0, "hit_rate": 0.0, "avg_verify_ms": 0.0}
+    return verifier.stats()
@@ -0,0 +1,112 @@
+# app/services/trip_cache.py
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import TripCache
+
+
+def normalize_trip_request(data: dict) -> tuple:
+    """
+    (from, to, days, style) with case and whitespace folded, so
+    "Bangalore " / "bangalore" and "2" / 2 share one cache entry.
+    """
+    def fold(value):
+        return " ".join(str(value).split()).casefold()
+
+    return fold(data["from"]), fold(data["to"]), int(data["days"]), fold(data["style"])
+
+
+def make_trip_cache_key(data: dict) -> str:
+    return "|".join(str(part) for part in normalize_trip_request(data))
+
+
+def get_cached_itinerary(db: Session, key: str):
+    try:
+        row = db.get(TripCache, key)
+        if row is None or row.expires_at <= datetime.utcnow():
+            return None
+        return row.ai_raw_text
+    finally:
+        # End the read transaction so the pooled connection is not held
+        # while Gemini generates on a miss
+        db.rollback()
+
+
+def store_itinerary(db: Session, key: str, ai_text: str):
+    now = datetime.utcnow()
+
+    # Opportunistic cleanup, cheap thanks to the expires_at index
+    db.query(TripCache).filter(TripCache.expires_at <= now).delete()
+
+    db.merge(
+        TripCache(
+            cache_key=key,
+            ai_raw_text=ai_text,
+            expires_at=now + timedelta(seconds=settings.TRIP_CACHE_TTL_SECONDS),
+        )
+    )
+    db.commit()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first
+    caller starts fn as its own task, everyone (the first caller too)
+    awaits that task. Callers cancelled while waiting, e.g. on a client
+    disconnect, leave the call running for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved: no warning when nobody is left waiting
+
+
+_inflight = SingleFlight()
+
+
+async def get_or_generate_itinerary(db: Session, data: dict, generate):
+    """
+    Return (ai_text, cached). Serves a fresh cached itinerary when there is
+    one; otherwise awaits generate() once per key no matter how many
+    identical requests arrive together, and caches what it returns.
+    Database work runs in the threadpool, off the event loop.
+    """
+    key = make_trip_cache_key(data)
+
+    ai_text = await run_in_threadpool(get_cached_itinerary, db, key)
+    if ai_text is not None:
+        return ai_text, True
+
+    async def fetch():
+        # May outlive the request that started it: its own session
+        fetch_db = SessionLocal()
+        try:
+            # Another request may have filled the cache while we waited
+            cached = await run_in_threadpool(get_cached_itinerary, fetch_db, key)
+            if cached is not None:
+                return cached
+            text = await generate()
+            await run_in_threadpool(store_itinerary, fetch_db, key, text)
+            return text
+        finally:
+            fetch_db.close()
+
+    return await _inflight.do(key, fetch), False
@@ -0,0 +1,32 @@
+# app/services/users.py
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models import User
+
+
+def get_user_id(db: Session, uid: str) -> Optional[int]:
+    return db.execute(select(User.id).where(User.uid == uid)).scalar()
+
+
+def get_or_create_user_id(db: Session, uid: str, email: Optional[str] = None) -> int:
+    """
+    users.id for a Firebase UID, creating the row on first sight.
+    Tables keyed by users.id (documents, service_records, ...) use this.
+    """
+    user_id = get_user_id(db, uid)
+    if user_id is not None:
+        return user_id
+
+    user = User(uid=uid, email=email)
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request created it first
+        db.rollback()
+        return db.execute(select(User.id).where(User.uid == uid)).scalar_one()
+    return user.id
@@ -0,0 +1,74 @@
+# benchmarks/bench_code_fastpath.py
+# QR/barcode fast path: what a detection attempt costs on documents
+# without a code (pure overhead before OCR), what serving from a code
+# costs, and the full OCR path it replaces when Tesseract is installed.
+#
+#   python -m benchmarks.bench_code_fastpath [--runs N]
+#
+# Uses synthetic 12-MP phone photos of a card, with and without a QR code.
+
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+import doc_ocr_backend
+from app.services.code_scan import expiry_from_codes
+
+PAYLOAD = "PUC CERTIFICATE NO: KA05/2024/0123\nREG NO: KA05MX1234\nVALID UPTO: 12/05/2027"
+
+
+def card_photo(with_qr):
+    rng = np.random.default_rng(5)
+    img = rng.integers(90, 140, size=(3000, 4000), dtype=np.uint8)
+    cv2.rectangle(img, (600, 500), (3400, 2500), 235, -1)
+    for i in range(12):
+        cv2.putText(img, f"REG NO KA05MX{1234 + i}  ISSUED 01/01/2024", (700, 700 + i * 110),
+                    cv2.FONT_HERSHEY_SIMPLEX, 2.0, 20, 4)
+    if with_qr:
+        qr = cv2.QRCodeEncoder.create().encode(PAYLOAD)
+        qr = cv2.resize(qr, None, fx=12, fy=12, interpolation=cv2.INTER_NEAREST)
+        y, x = 1500, 2700
+        img[y:y + qr.shape[0], x:x + qr.shape[1]] = qr
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for with_qr in (True, False):
+        label = "card with QR" if with_qr else "card without QR"
+        img_bytes = card_photo(with_qr)
+        gray = doc_ocr_backend.decode_gray(img_bytes)
+
+        ms, found = median_ms(lambda: expiry_from_codes(gray), args.runs)
+        served = f"expiry {found[1].iso}" if found else "no expiry, falls through to OCR"
+        print(f"{label:<16} code scan {ms:7.1f} ms  -> {served}")
+
+        try:
+            params = {**doc_ocr_backend.PREPROCESS_PARAMS, "code_fastpath": False}
+            doc_ocr_backend.PREPROCESS_PARAMS, saved = params, doc_ocr_backend.PREPROCESS_PARAMS
+            try:
+                ms, _ = median_ms(lambda: doc_ocr_backend.ocr_image_bytes(img_bytes), args.runs)
+            finally:
+                doc_ocr_backend.PREPROCESS_PARAMS = saved
+            print(f"{'':<16} full OCR  {ms:7.1f} ms")
+        except Exception as e:
+            print(f"{'':<16} full OCR  skipped ({type(e).__name__}: Tesseract not available?)")
+
+
+if __name__ == "__main__":
+    main()
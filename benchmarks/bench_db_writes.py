@@ -0,0 +1,95 @@
+# benchmarks/bench_db_writes.py
+# Concurrent Trip inserts, one commit each like generate_trip: the old
+# engine (rollback journal, default pool) vs create_db_engine() (WAL,
+# synchronous=NORMAL, busy timeout, mmap), each on a fresh SQLite file.
+#
+#   python -m benchmarks.bench_db_writes [--threads N] [--inserts N]
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine
+from app.db.models import Trip
+
+
+def old_engine(url):
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+
+def run(engine, threads, inserts):
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(threads)
+
+    def writer(w):
+        start_gate.wait()
+        for i in range(inserts):
+            db = Session()
+            start = time.perf_counter()
+            try:
+                db.add(Trip(
+                    user_id=f"user-{w}",
+                    from_place="Bangalore",
+                    to_place=f"Town {i}",
+                    days=2,
+                    style="Relaxed",
+                    ai_raw_text="- Day 1 - drive\n- Day 2 - return\n" * 20,
+                ))
+                db.commit()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+            except OperationalError as e:
+                db.rollback()
+                with lock:
+                    errors.append(str(e.orig))
+            finally:
+                db.close()
+
+    workers = [threading.Thread(target=writer, args=(w,)) for w in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    total = time.perf_counter() - start
+
+    engine.dispose()
+    return total, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--inserts", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.inserts} inserts, commit per insert")
+    print(f"{'engine':<8} {'inserts/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'locked':>7}")
+    for name, factory in (("old", old_engine), ("tuned", create_db_engine)):
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "writes.db")
+        total, latencies, errors = run(factory(url), args.threads, args.inserts)
+        if latencies:
+            q = statistics.quantiles(latencies, n=20)
+            p50, p95 = statistics.median(latencies), q[18]
+        else:
+            p50 = p95 = float("nan")
+        print(
+            f"{name:<8} {len(latencies) / total:>10.0f} {p50 * 1000:>8.2f} "
+            f"{p95 * 1000:>8.2f} {len(errors):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
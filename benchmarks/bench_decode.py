@@ -0,0 +1,92 @@
+# benchmarks/bench_decode.py
+# Image decode stage of the OCR pipeline: the old path (PIL RGB -> NumPy
+# -> BGR -> gray) vs decode_gray() straight to grayscale, full size and
+# DCT-reduced. Reports median latency and peak traced memory per image.
+#
+#   python -m benchmarks.bench_decode [corpus_dir] [--runs N]
+#
+# Besides the corpus images, always includes a synthetic 12-MP phone
+# photo (4000x3000 JPEG with an EXIF rotation).
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+from io import BytesIO
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from benchmarks.bench_preprocess import load_corpus
+from app.services.ocr_preprocess import decode_gray
+
+
+def legacy_decode(img_bytes):
+    pil_img = Image.open(BytesIO(img_bytes)).convert("RGB")
+    img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)  # first step of preprocess_image
+
+
+def synthetic_photo():
+    rng = np.random.default_rng(3)
+    img = rng.integers(90, 140, size=(3000, 4000, 3), dtype=np.uint8)  # background
+    cv2.rectangle(img, (600, 500), (3400, 2500), (235, 235, 235), -1)   # the card
+    for i in range(20):
+        cv2.putText(
+            img, f"VALID UPTO 28/05/20{30 + i % 10}  POLICY NO 3001/{i:04d}",
+            (700, 650 + i * 90), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (20, 20, 20), 4,
+        )
+    pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    exif = pil_img.getexif()
+    exif[0x0112] = 6  # orientation: rotate 90 CW to display
+    out = BytesIO()
+    pil_img.save(out, "JPEG", quality=90, exif=exif.tobytes())
+    return out.getvalue()
+
+
+def measure(fn, img_bytes, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = fn(img_bytes)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(img_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, out.shape
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus_dir", nargs="?", default=".")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    images = [("synthetic_12mp.jpg", synthetic_photo())]
+    for path, _ in load_corpus(args.corpus_dir):
+        with open(path, "rb") as f:
+            images.append((os.path.basename(path), f.read()))
+
+    paths = {
+        "legacy": legacy_decode,
+        "gray": lambda b: decode_gray(b, 1),
+        "gray/2": lambda b: decode_gray(b, 2),
+        "gray/4": lambda b: decode_gray(b, 4),
+    }
+
+    print(f"{'image':<24} {'path':<8} {'ms':>8} {'peak MB':>8} {'shape':>12}")
+    for name, img_bytes in images:
+        for label, fn in paths.items():
+            seconds, peak, shape = measure(fn, img_bytes, args.runs)
+            print(
+                f"{name:<24} {label:<8} {seconds * 1000:>8.1f} "
+                f"{peak / 1e6:>8.1f} {'x'.join(map(str, shape)):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_doc_crop.py
+# Document boundary crop before OCR: pixels handed to Tesseract,
+# preprocess + OCR latency and expiry accuracy with and without it.
+#
+#   python -m benchmarks.bench_doc_crop [corpus_dir] [--runs N]
+#
+# corpus_dir as for bench_preprocess (images + optional labels.json).
+# Always includes synthetic 12-MP phone photos of a tilted card on a
+# cluttered background, labelled with the card's expiry and corners.
+
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.bench_preprocess import iso, load_corpus
+from app.services.ocr_engine import get_engine
+from app.services.ocr_preprocess import PREPROCESS_PARAMS, find_document_quad, preprocess_image
+
+MODES = {
+    "whole": {**PREPROCESS_PARAMS, "doc_crop": False},
+    "crop": {**PREPROCESS_PARAMS, "doc_crop": True},
+}
+
+
+def synthetic_photo(seed, expiry):
+    """(BGR photo, expected expiry, true corners) of a card shot at an angle."""
+    rng = np.random.default_rng(seed)
+    h, w = 3000, 4000
+
+    # Dashboard/table: noise, plus a few dark and light objects
+    photo = rng.integers(60, 120, size=(h, w), dtype=np.uint8)
+    photo = cv2.GaussianBlur(photo, (9, 9), 0)
+    for _ in range(6):
+        x, y = int(rng.integers(0, w - 600)), int(rng.integers(0, h - 400))
+        cv2.rectangle(photo, (x, y), (x + 500, y + 300), int(rng.integers(20, 200)), -1)
+
+    card = np.full((1080, 1700), 240, np.uint8)
+    lines = ["REGISTRATION CERTIFICATE", "REG NO KA05MX1234", "ISSUED 01/01/2024", f"VALID UPTO {expiry}", "FUEL PETROL"]
+    for i, line in enumerate(lines):
+        cv2.putText(card, line, (80, 160 + i * 180), cv2.FONT_HERSHEY_SIMPLEX, 2.2, 20, 5)
+
+    cx, cy = w / 2 + rng.uniform(-300, 300), h / 2 + rng.uniform(-200, 200)
+    jitter = lambda: rng.uniform(-120, 120)  # noqa: E731
+    corners = np.array([
+        [cx - 1000 + jitter(), cy - 650 + jitter()],
+        [cx + 1000 + jitter(), cy - 650 + jitter()],
+        [cx + 1000 + jitter(), cy + 650 + jitter()],
+        [cx - 1000 + jitter(), cy + 650 + jitter()],
+    ], dtype=np.float32)
+    src = np.array([[0, 0], [1699, 0], [1699, 1079], [0, 1079]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(src, corners)
+    warped = cv2.warpPerspective(card, matrix, (w, h))
+    mask = cv2.warpPerspective(np.full_like(card, 255), matrix, (w, h))
+    photo[mask > 0] = warped[mask > 0]
+
+    return cv2.cvtColor(photo, cv2.COLOR_GRAY2BGR), expiry, corners
+
+
+def run(img, params, runs, with_ocr):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        processed = preprocess_image(img, params)
+        text = get_engine().image_to_string(processed) if with_ocr else ""
+        times.append(time.perf_counter() - start)
+    return processed.size, statistics.median(times) * 1000, iso(text) if with_ocr else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus_dir", nargs="?", default=".")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        get_engine().image_to_string(np.full((32, 32), 255, np.uint8))
+        with_ocr = True
+    except Exception as e:
+        print(f"OCR skipped ({type(e).__name__}): preprocessing only\n")
+        with_ocr = False
+
+    samples = [(path, cv2.imread(path), expected, None) for path, expected in load_corpus(args.corpus_dir)]
+    for seed, expiry in enumerate(("28/05/2031", "14/11/2027", "03/02/2029")):
+        img, expected, corners = synthetic_photo(seed, expiry)
+        samples.append((f"synthetic-{seed}", img, expected, corners))
+
+    totals = {mode: {"pixels": 0, "ms": 0.0, "correct": 0, "labelled": 0} for mode in MODES}
+
+    print(f"{'image':<24} {'mode':<6} {'OCR Mpx':>8} {'ms':>8}  expiry")
+    for name, img, expected, corners in samples:
+        if img is None:
+            continue
+        if corners is not None:
+            quad = find_document_quad(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+            if quad is None:
+                print(f"{name:<24} outline not found")
+            else:
+                error = np.abs(quad - corners).max()
+                print(f"{name:<24} outline found, worst corner off by {error:.0f} px")
+
+        for mode, params in MODES.items():
+            pixels, ms, expiry = run(img, params, args.runs, with_ocr)
+            t = totals[mode]
+            t["pixels"] += pixels
+            t["ms"] += ms
+            if expected is not None and with_ocr:
+                t["labelled"] += 1
+                t["correct"] += expiry is not None and expiry == iso(expected)
+            print(f"{name[-24:]:<24} {mode:<6} {pixels / 1e6:>8.2f} {ms:>8.0f}  {expiry}")
+
+    print()
+    for mode, t in totals.items():
+        accuracy = f"{t['correct']}/{t['labelled']}" if t["labelled"] else "n/a"
+        print(f"{mode:<6} total {t['pixels'] / 1e6:.1f} Mpx  {t['ms']:.0f} ms  expiry accuracy {accuracy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_doc_search.py
+# Document search over synthetic OCR text: FTS5 (search_documents, the
+# query behind GET /api/docs/search) vs LIKE '%…%' scans, scoped to one
+# user and across all documents, on a fresh migrated SQLite file.
+#
+#   python -m benchmarks.bench_doc_search [--docs N] [--users N] [--runs N]
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import text
+
+# Document-ish words, each present in ~30% of documents, on top of
+# Zipf-distributed filler (OCR noise, names, addresses)
+DOMAIN = (
+    "vehicle insurance policy number chassis engine registration owner "
+    "premium pollution certificate comprehensive nominee"
+).split()
+FILLER = [f"w{i:x}" for i in range(20000)]
+FILLER_CUM_WEIGHTS = list(itertools.accumulate(1 / (i + 1) for i in range(len(FILLER))))
+
+
+def synthetic_text(rng):
+    words = rng.choices(FILLER, cum_weights=FILLER_CUM_WEIGHTS, k=rng.randint(60, 160))
+    for word in DOMAIN:
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), word)
+    words.insert(rng.randrange(len(words)), f"KA{rng.randint(1, 60):02d}MX{rng.randint(1000, 9999)}")
+    if rng.random() < 0.01:
+        words.insert(rng.randrange(len(words)), "hypothecation")
+    return " ".join(words)
+
+
+def build(engine, docs, users):
+    rng = random.Random(42)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        batch = []
+        for i in range(docs):
+            batch.append({
+                "user_id": rng.randint(1, users),
+                "title": rng.choice(["Insurance", "PUC", "RC", "Licence"]),
+                "ocr_text": synthetic_text(rng),
+            })
+            if len(batch) == 5000:
+                conn.execute(
+                    text("INSERT INTO documents (user_id, title, ocr_text, status) "
+                         "VALUES (:user_id, :title, :ocr_text, 'done')"),
+                    batch,
+                )
+                batch = []
+        if batch:
+            conn.execute(
+                text("INSERT INTO documents (user_id, title, ocr_text, status) "
+                     "VALUES (:user_id, :title, :ocr_text, 'done')"),
+                batch,
+            )
+    return time.perf_counter() - start
+
+
+FTS_ALL = text(
+    "SELECT rowid, snippet(documents_fts, 2, '[', ']', '…', 12) FROM documents_fts "
+    "WHERE documents_fts MATCH :match ORDER BY bm25(documents_fts, 0.0, 2.0, 1.0) LIMIT 20"
+)
+
+
+def like_query(words, per_user):
+    where = " AND ".join(f"ocr_text LIKE :w{i}" for i in range(len(words)))
+    if per_user:
+        where += " AND user_id = :user_id"
+    return text(f"SELECT id FROM documents WHERE {where} ORDER BY id DESC LIMIT 20")
+
+
+def timed(conn, query, params, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        conn.execute(query, params).all()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "search.db")
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+    from sqlalchemy.orm import Session
+
+    from app.db.database import get_engine
+    from app.db.migrations import run_migrations
+    from app.services.doc_search import fts_query, search_documents
+
+    engine = get_engine()
+    run_migrations(engine)
+    print(f"inserted {args.docs} docs (FTS kept in sync by triggers) in {build(engine, args.docs, args.users):.1f} s")
+
+    # Common words, a rare word, a number prefix, and a word in no document
+    queries = ["policy number", "chassis", "hypothecation", "KA05MX12", "comprehensive nominee", "airbag"]
+    print(f"{'query':<24} {'fts user':>9} {'like user':>10} {'fts all':>8} {'like all':>9}  (median ms)")
+    with engine.connect() as conn, Session(engine) as db:
+        for q in queries:
+            words = q.split()
+            like_params = {f"w{i}": f"%{w}%" for i, w in enumerate(words)}
+            match = fts_query(q)
+            user_id = 7
+
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                search_documents(db, user_id, q)
+                times.append(time.perf_counter() - start)
+
+            print(
+                f"{q:<24} "
+                f"{statistics.median(times) * 1000:>9.2f} "
+                f"{timed(conn, like_query(words, True), {**like_params, 'user_id': user_id}, args.runs):>10.2f} "
+                f"{timed(conn, FTS_ALL, {'match': match}, args.runs):>8.2f} "
+                f"{timed(conn, like_query(words, False), like_params, args.runs):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_download.py
+# Download latency against a local stand-in for Firebase Storage:
+# a fresh connection per request (old behaviour) vs the pooled client,
+# plus repeat fetches answered with 304 Not Modified.
+#
+#   python -m benchmarks.bench_download [--requests N] [--size BYTES]
+
+import argparse
+import hashlib
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.services.http_client import HttpClient
+
+
+def make_handler(payload):
+    etag = '"' + hashlib.sha256(payload).hexdigest()[:16] + '"'
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def timed(fn, n):
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, max(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--size", type=int, default=2 * 1024 * 1024)
+    args = parser.parse_args()
+
+    payload = bytes(range(256)) * (args.size // 256)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(payload))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/doc.jpg"
+
+    # Pooled, but conditional GET disabled so every request moves the body
+    pooled = HttpClient(validator_cache_bytes=0)
+    conditional = HttpClient()
+
+    rows = [
+        ("requests.get (new connection)", lambda: requests.get(url, timeout=15).content),
+        ("pooled client", lambda: pooled.fetch(url)),
+        ("pooled client + 304", lambda: conditional.fetch(url)),
+    ]
+
+    print(f"{args.requests} requests, {len(payload)} byte body")
+    print(f"{'mode':<32} {'median ms':>10} {'max ms':>10}")
+    for name, fn in rows:
+        median, worst = timed(fn, args.requests)
+        print(f"{name:<32} {median:>10.2f} {worst:>10.2f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_expiry.py
+# Microbenchmark + accuracy check of the shared expiry extractor against
+# the old per-call re.search chain, over a corpus of OCR outputs.
+#
+#   python -m benchmarks.bench_expiry [--runs N]
+
+import argparse
+import json
+import os
+import re
+import timeit
+
+from app.services.date_extract import extract_expiry
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "expiry_corpus.json")
+
+_MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+
+# The extractor doc_ocr_backend used before: five patterns, each
+# searched in turn over the whole text, first match wins.
+LEGACY_PATTERNS = [
+    r"(?:expiry\s*date|valid\s*upto|valid\s*till|expires)[^\d]*"
+    rf"(\d{{1,2}}(?:st|nd|rd|th)?\s*(?:of\s*)?(?:{_MONTHS})[,\s]*\d{{4}})",
+    rf"(\d{{1,2}}(?:st|nd|rd|th)?\s*(?:{_MONTHS})\s*\d{{4}})",
+    rf"((?:{_MONTHS})\s*\d{{1,2}}\s*\d{{4}})",
+    r"(\d{1,2}[\/\-.]\d{1,2}[\/\-.]\d{2,4})",
+    r"(\d{4}[\/\-.]\d{1,2}[\/\-.]\d{1,2})",
+]
+
+
+def legacy_extract(text):
+    text = text.replace("\n", " ")
+    for p in LEGACY_PATTERNS:
+        m = re.search(p, text, re.IGNORECASE)
+        if m:
+            return m.group(1)
+    return None
+
+
+def iso_of(raw):
+    found = extract_expiry(raw or "")
+    return found.iso if found else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    legacy_ok = shared_ok = 0
+    for entry in corpus:
+        legacy = iso_of(legacy_extract(entry["text"]))
+        shared = extract_expiry(entry["text"])
+        shared = shared.iso if shared else None
+
+        legacy_ok += legacy == entry["expected"]
+        shared_ok += shared == entry["expected"]
+        if shared != entry["expected"]:
+            print(f"MISS {entry['doc_type']}: expected {entry['expected']}, got {shared}")
+
+    texts = [entry["text"] for entry in corpus]
+
+    legacy_s = timeit.timeit(lambda: [legacy_extract(t) for t in texts], number=args.runs)
+    shared_s = timeit.timeit(lambda: [extract_expiry(t) for t in texts], number=args.runs)
+    per_doc = args.runs * len(texts)
+
+    print(f"{len(corpus)} documents, {args.runs} runs")
+    print(f"{'extractor':<10} {'accuracy':>10} {'us/doc':>10}")
+    print(f"{'legacy':<10} {legacy_ok:>5}/{len(corpus):<4} {legacy_s / per_doc * 1e6:>10.1f}")
+    print(f"{'shared':<10} {shared_ok:>5}/{len(corpus):<4} {shared_s / per_doc * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
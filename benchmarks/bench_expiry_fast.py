@@ -0,0 +1,89 @@
+# benchmarks/bench_expiry_fast.py
+# mode=expiry_fast (coarse keyword pass + OCR of the regions around the
+# keywords) vs full-page OCR: latency, expiry accuracy and how often the
+# fast mode falls back to the full page.
+#
+#   python -m benchmarks.bench_expiry_fast [corpus_dir] [--runs N]
+#
+# corpus_dir as for bench_preprocess (images + optional labels.json),
+# plus the synthetic card photos of bench_doc_crop. Needs Tesseract.
+
+import argparse
+import statistics
+import time
+
+import cv2
+
+from app.services.expiry_roi import ocr_expiry_regions
+from app.services.ocr_engine import get_engine
+from benchmarks.bench_doc_crop import synthetic_photo
+from benchmarks.bench_preprocess import iso, load_corpus
+from app.services.ocr_preprocess import PREPROCESS_PARAMS, preprocess_image
+
+
+def full_page(processed, engine):
+    return engine.image_to_string(processed), "ocr"
+
+
+def expiry_fast(processed, engine):
+    text = ocr_expiry_regions(processed, engine, PREPROCESS_PARAMS["expiry_fast_scale"])
+    if text is not None:
+        return text, "roi"
+    return engine.image_to_string(processed), "ocr"
+
+
+MODES = {"full": full_page, "expiry_fast": expiry_fast}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus_dir", nargs="?", default=".")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    engine.warm()
+
+    samples = [(path, cv2.imread(path), expected) for path, expected in load_corpus(args.corpus_dir)]
+    for seed, expiry in enumerate(("28/05/2031", "14/11/2027", "03/02/2029")):
+        img, expected, _ = synthetic_photo(seed, expiry)
+        samples.append((f"synthetic-{seed}", img, expected))
+
+    totals = {mode: {"ms": 0.0, "correct": 0, "labelled": 0, "fallbacks": 0} for mode in MODES}
+
+    print(f"{'image':<24} {'mode':<12} {'ms':>8}  path  expiry")
+    for name, img, expected in samples:
+        if img is None:
+            continue
+        processed = preprocess_image(img)
+
+        for mode, run in MODES.items():
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                text, path = run(processed, engine)
+                times.append(time.perf_counter() - start)
+            ms = statistics.median(times) * 1000
+            expiry = iso(text)
+
+            t = totals[mode]
+            t["ms"] += ms
+            t["fallbacks"] += mode == "expiry_fast" and path == "ocr"
+            if expected is not None:
+                t["labelled"] += 1
+                t["correct"] += expiry is not None and expiry == iso(expected)
+            print(f"{name[-24:]:<24} {mode:<12} {ms:>8.0f}  {path:<4}  {expiry}")
+
+    print()
+    for mode, t in totals.items():
+        accuracy = f"{t['correct']}/{t['labelled']}" if t["labelled"] else "n/a"
+        print(
+            f"{mode:<12} total {t['ms']:.0f} ms  expiry accuracy {accuracy}  "
+            f"full-page fallbacks {t['fallbacks']}"
+        )
+    if totals["full"]["ms"]:
+        print(f"\nexpiry_fast / full latency: {totals['expiry_fast']['ms'] / totals['full']['ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_gemini_client.py
+# Cold (new connection per call, the old ask_gemini behaviour) vs warm
+# (shared pooled GeminiClient) latency against the local fake Gemini.
+#
+#   python -m benchmarks.bench_gemini_client [--calls N] [--delay S]
+#
+# Over plain HTTP this only shows TCP setup; against the real HTTPS
+# endpoint the cold path also pays a TLS handshake per call.
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from app.services.llm_client import GeminiClient
+from benchmarks.fake_gemini import FakeGemini
+
+
+def cold_call(base_url, prompt):
+    resp = requests.post(
+        f"{base_url}/models/gemini-1.5-flash:generateContent",
+        params={"key": "test-key"},
+        json={"contents": [{"parts": [{"text": prompt}]}]},
+        timeout=40,
+    )
+    return resp.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def measure(fn, calls):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, statistics.mean(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    prompt = "Create a 2-day road trip itinerary from Bangalore to Mysore"
+
+    with FakeGemini(delay=args.delay) as fake:
+        client = GeminiClient("test-key", base_url=fake.base_url)
+
+        rows = [
+            ("cold (requests.post)", lambda: cold_call(fake.base_url, prompt)),
+            ("warm (GeminiClient)", lambda: client.generate_text(prompt)),
+        ]
+
+        print(f"{args.calls} calls, server delay {args.delay * 1000:.0f} ms")
+        print(f"{'mode':<24} {'median ms':>10} {'mean ms':>10}")
+        for name, fn in rows:
+            median, mean = measure(fn, args.calls)
+            print(f"{name:<24} {median:>10.2f} {mean:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
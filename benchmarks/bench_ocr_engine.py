@@ -0,0 +1,77 @@
+# benchmarks/bench_ocr_engine.py
+# Compare the pytesseract CLI engine with the warm tesserocr engine.
+# Besides repeated calls on one thread, calls are timed from a fresh
+# thread each, as the Flask server makes them (one thread per request).
+#
+#   python -m benchmarks.bench_ocr_engine [image ...] [--runs N]
+#
+# Defaults to the sample images in the repo root.
+
+import argparse
+import statistics
+import threading
+import time
+
+import cv2
+
+from app.services.ocr_engine import create_engine, tesserocr
+
+SAMPLES = ["received_raw.jpg", "processed_output.jpg"]
+
+
+def bench(engine, img, runs):
+    # First call is reported separately: it includes model load
+    start = time.perf_counter()
+    engine.image_to_string(img)
+    first = time.perf_counter() - start
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        engine.image_to_string(img)
+        timings.append(time.perf_counter() - start)
+
+    return first, statistics.median(timings), statistics.median(fresh_thread_timings(engine, img, runs))
+
+
+def fresh_thread_timings(engine, img, runs):
+    timings = []
+
+    def call():
+        start = time.perf_counter()
+        engine.image_to_string(img)
+        timings.append(time.perf_counter() - start)
+
+    for _ in range(runs):
+        thread = threading.Thread(target=call)
+        thread.start()
+        thread.join()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="*", default=SAMPLES)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    kinds = ["pytesseract"]
+    if tesserocr is not None:
+        kinds.append("tesserocr")
+    else:
+        print("tesserocr not installed, benchmarking pytesseract only")
+
+    print(f"{'image':<24} {'engine':<12} {'first ms':>10} {'median ms':>10} {'new thread':>10}")
+    for path in args.images:
+        img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            print(f"{path}: cannot read, skipped")
+            continue
+
+        for kind in kinds:
+            first, median, fresh = bench(create_engine(kind), img, args.runs)
+            print(f"{path:<24} {kind:<12} {first * 1000:>10.1f} {median * 1000:>10.1f} {fresh * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_preprocess.py
+# Fixed 2.5x upscale vs adaptive (text-height based) scaling:
+# latency, peak memory and expiry-extraction accuracy per image.
+#
+#   python -m benchmarks.bench_preprocess [corpus_dir]
+#
+# corpus_dir holds document images and an optional labels.json mapping
+# file name -> expected expiry string, e.g. {"rc_front.jpg": "28/05/2031"}.
+# Defaults to the sample images in the repo root.
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+import cv2
+
+from app.services.date_extract import extract_expiry
+from app.services.ocr_engine import get_engine
+from app.services.ocr_preprocess import PREPROCESS_PARAMS, preprocess_image
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+MODES = {
+    "fixed": {**PREPROCESS_PARAMS, "scaling": "fixed"},
+    "adaptive": {**PREPROCESS_PARAMS, "scaling": "adaptive"},
+}
+
+
+def load_corpus(corpus_dir):
+    labels = {}
+    labels_path = os.path.join(corpus_dir, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path, encoding="utf-8") as f:
+            labels = json.load(f)
+
+    names = sorted(
+        n for n in os.listdir(corpus_dir)
+        if n.lower().endswith(IMAGE_EXTS)
+    )
+    return [(os.path.join(corpus_dir, n), labels.get(n)) for n in names]
+
+
+def iso(value):
+    found = extract_expiry(value or "")
+    return found.iso if found else None
+
+
+def run(img, params):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    processed = preprocess_image(img, params)
+    text = get_engine().image_to_string(processed)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return processed.shape, elapsed, peak, iso(text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus_dir", nargs="?", default=".")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir)
+    totals = {mode: {"time": 0.0, "peak": 0, "correct": 0, "labelled": 0} for mode in MODES}
+
+    print(f"{'image':<28} {'mode':<9} {'ocr size':>12} {'ms':>8} {'peak MB':>8}  expiry")
+    for path, expected in corpus:
+        img = cv2.imread(path)
+        if img is None:
+            continue
+
+        for mode, params in MODES.items():
+            shape, elapsed, peak, expiry = run(img, params)
+
+            t = totals[mode]
+            t["time"] += elapsed
+            t["peak"] = max(t["peak"], peak)
+            if expected is not None:
+                t["labelled"] += 1
+                t["correct"] += expiry is not None and expiry == iso(expected)
+
+            size = f"{shape[1]}x{shape[0]}"
+            print(
+                f"{os.path.basename(path):<28} {mode:<9} {size:>12} "
+                f"{elapsed * 1000:>8.0f} {peak / 2**20:>8.1f}  {expiry}"
+            )
+
+    print()
+    for mode, t in totals.items():
+        accuracy = f"{t['correct']}/{t['labelled']}" if t["labelled"] else "n/a"
+        print(
+            f"{mode:<9} total {t['time']:.2f}s  max peak {t['peak'] / 2**20:.1f} MB  "
+            f"expiry accuracy {accuracy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
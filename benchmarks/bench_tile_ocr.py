@@ -0,0 +1,97 @@
+# benchmarks/bench_tile_ocr.py
+# Tile-parallel OCR of a tall page: latency vs number of worker threads,
+# against one Tesseract run over the whole page, and whether the
+# stitched text still carries the expiry date.
+#
+#   python -m benchmarks.bench_tile_ocr [--runs N] [--workers 1,2,4,8]
+#
+# Uses a synthetic multi-paragraph insurance policy (A4 at 300 dpi,
+# preprocessed as in the OCR pipeline). Needs Tesseract for the OCR
+# timings; the band split is reported either way.
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from app.services.ocr_engine import get_engine
+from benchmarks.bench_preprocess import iso
+from app.services.ocr_preprocess import PREPROCESS_PARAMS, preprocess_image
+from doc_ocr_backend import ocr_page, split_bands
+
+EXPIRY = "27/09/2027"
+
+CLAUSES = [
+    "The insurer will indemnify the insured against loss or damage to the vehicle",
+    "by fire, explosion, self ignition, lightning, burglary, housebreaking or theft",
+    "riot and strike, earthquake, flood, typhoon, hurricane, storm, cyclone, hailstorm",
+    "accidental external means, malicious act, terrorist activity, whilst in transit",
+    "subject to the deductibles, exclusions and conditions stated in this schedule",
+]
+
+
+def policy_page():
+    page = np.full((3508, 2480), 245, np.uint8)
+    y = 160
+    lines = ["MOTOR INSURANCE POLICY SCHEDULE", "POLICY NO 3001/0042/7781", f"PERIOD OF INSURANCE FROM 28/09/2026 VALID TILL {EXPIRY}"]
+    lines += [CLAUSES[i % len(CLAUSES)] for i in range(48)]
+    for i, line in enumerate(lines):
+        if i and i % 8 == 3:
+            y += 40  # paragraph break
+        cv2.putText(page, line, (140, y), cv2.FONT_HERSHEY_SIMPLEX, 1.25, 25, 3)
+        y += 62
+    return page
+
+
+def median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", default=None, help="comma-separated thread counts")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = [int(n) for n in args.workers.split(",")] if args.workers else sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+
+    processed = preprocess_image(policy_page())
+    split_ms, bands = median_ms(
+        lambda: split_bands(processed, PREPROCESS_PARAMS["tile_height"], PREPROCESS_PARAMS["tile_overlap"]),
+        args.runs,
+    )
+    print(f"page {processed.shape[1]}x{processed.shape[0]}, {len(bands)} bands, split {split_ms:.1f} ms")
+    for top, bottom, own_top, own_bottom in bands:
+        print(f"  rows {top:>5}-{bottom:<5} owns {own_top:>5}-{own_bottom}")
+
+    engine = get_engine()
+    try:
+        engine.warm()
+        single_ms, text = median_ms(lambda: engine.image_to_string(processed), args.runs)
+    except Exception as e:
+        print(f"\nOCR skipped ({type(e).__name__})")
+        return
+
+    print(f"\n{'threads':>7} {'ms':>8} {'speedup':>8}  expiry")
+    print(f"{'whole':>7} {single_ms:>8.0f} {1.0:>8.2f}  {iso(text)}")
+    for n in counts:
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            # First run loads the Tesseract handles the threads use
+            ocr_page(processed, executor=pool)
+            ms, text = median_ms(lambda: ocr_page(processed, executor=pool), args.runs)
+        print(f"{n:>7} {ms:>8.0f} {single_ms / ms:>8.2f}  {iso(text)}")
+    print(f"\nexpected expiry {iso(EXPIRY)}, {cores} cores")
+
+
+if __name__ == "__main__":
+    main()
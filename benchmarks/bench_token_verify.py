@@ -0,0 +1,91 @@
+# benchmarks/bench_token_verify.py
+# Firebase ID token verification: full RS256 check on every request vs the
+# cached verifier, using a locally generated key pair and self-signed cert
+# (no network, no Firebase project needed). Correctness is covered by
+# tests/test_token_verifier.py.
+#
+#   python -m benchmarks.bench_token_verify [--requests N] [--users N]
+
+import argparse
+import datetime
+import random
+import time
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.services.token_verifier import CertCache, FirebaseTokenVerifier
+
+PROJECT_ID = "bench-project"
+KID = "bench-kid"
+
+
+def make_signing_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "bench")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    pem = cert.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+    return key, {KID: pem}
+
+
+def make_token(key, uid, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": uid,
+        "iat": now,
+        "auth_time": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": KID})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    key, certs = make_signing_key()
+    cert_cache = CertCache(fetch=lambda: (certs, 3600))
+    cert_cache.refresh()
+
+    # Each user sends many requests with the same token, as the app does
+    # until Firebase rotates it an hour later
+    tokens = [make_token(key, f"user-{i}") for i in range(args.users)]
+    stream = [random.choice(tokens) for _ in range(args.requests)]
+
+    uncached = FirebaseTokenVerifier(PROJECT_ID, cert_cache, max_entries=0)
+    cached = FirebaseTokenVerifier(PROJECT_ID, cert_cache)
+
+    print(f"{args.requests} requests from {args.users} users")
+    print(f"{'verifier':<10} {'total ms':>9} {'us/req':>8} {'hit rate':>9}")
+    for name, verifier in (("uncached", uncached), ("cached", cached)):
+        start = time.perf_counter()
+        for token in stream:
+            assert verifier.verify(token)["uid"].startswith("user-")
+        total = time.perf_counter() - start
+        stats = verifier.stats()
+        print(
+            f"{name:<10} {total * 1000:>9.1f} {total / len(stream) * 1e6:>8.1f} "
+            f"{stats['hit_rate']:>9.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
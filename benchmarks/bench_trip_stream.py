@@ -0,0 +1,95 @@
+# benchmarks/bench_trip_stream.py
+# Time-to-first-item: /api/trip/generate (whole response) vs
+# /api/trip/generate/stream (NDJSON), served by uvicorn against the
+# fake Gemini streaming its reply over --delay seconds.
+#
+#   python -m benchmarks.bench_trip_stream [--runs N] [--delay S]
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import httpx
+
+from benchmarks.fake_gemini import FakeGemini
+
+
+def start_api():
+    # Imported late: settings read GEMINI_BASE_URL / DATABASE_URL from env
+    import uvicorn
+
+    from app.api.deps import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: {"uid": "bench"}
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=8765, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, "http://127.0.0.1:8765"
+
+
+def body(i):
+    # Unique destination per run so the itinerary cache never hits
+    return {"from": "Bangalore", "to": f"Town {i}", "days": "2", "style": "Relaxed"}
+
+
+def time_full(client, i):
+    start = time.perf_counter()
+    resp = client.post("/api/trip/generate", json=body(i))
+    resp.raise_for_status()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def time_stream(client, i):
+    start = time.perf_counter()
+    first = None
+    with client.stream("POST", "/api/trip/generate/stream", json=body(i)) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            event = json.loads(line)
+            if event["type"] == "item" and first is None:
+                first = time.perf_counter() - start
+            if event["type"] == "error":
+                raise RuntimeError(event["detail"])
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with FakeGemini(delay=args.delay) as fake:
+        os.environ["GEMINI_BASE_URL"] = fake.base_url
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "stream.db")
+        server, base_url = start_api()
+
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            print(f"{args.runs} runs, Gemini generation spread over {args.delay:.1f} s")
+            print(f"{'endpoint':<10} {'first item ms':>14} {'complete ms':>12}")
+            run = 0
+            for name, fn in (("generate", time_full), ("stream", time_stream)):
+                firsts, totals = [], []
+                for _ in range(args.runs):
+                    run += 1
+                    first, total = fn(client, run)
+                    firsts.append(first)
+                    totals.append(total)
+                print(
+                    f"{name:<10} {statistics.median(firsts) * 1000:>14.0f} "
+                    f"{statistics.median(totals) * 1000:>12.0f}"
+                )
+
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/fake_gemini.py
+# Local stand-in for the Gemini REST API, for benchmarks and manual runs
+# without network access or an API key.
+#
+#   python -m benchmarks.fake_gemini [--port 8089] [--delay 0.2]
+#
+# then point the backends at it with GEMINI_BASE_URL=http://127.0.0.1:8089/v1beta
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "- Day 1 - Drive out early, breakfast stop on the highway, evening at the palace\n"
+    "- Day 2 - Morning at the gardens, lunch in town, drive back before dark\n"
+)
+
+
+# streamGenerateContent sends the reply in pieces this size, with
+# delay spread evenly across them
+STREAM_CHUNK_CHARS = 24
+
+
+def make_handler(reply, delay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive like the real API
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+
+            if ":streamGenerateContent" in self.path:
+                self._stream()
+                return
+
+            if ":generateContent" not in self.path:
+                self.send_error(404)
+                return
+
+            time.sleep(delay)  # model "thinking" time
+
+            body = json.dumps({
+                "candidates": [{"content": {"parts": [{"text": reply}]}}]
+            }).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self):
+            chunks = [
+                reply[i:i + STREAM_CHUNK_CHARS]
+                for i in range(0, len(reply), STREAM_CHUNK_CHARS)
+            ]
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            for chunk in chunks:
+                time.sleep(delay / len(chunks))
+                event = json.dumps({
+                    "candidates": [{"content": {"parts": [{"text": chunk}]}}]
+                })
+                self.wfile.write(f"data: {event}\r\n\r\n".encode("utf-8"))
+                self.wfile.flush()
+
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default backlog of 5 drops load-test connections
+
+
+class FakeGemini:
+    """
+    Fake Gemini server on a background thread:
+
+        with FakeGemini(delay=0.1) as fake:
+            client = GeminiClient("test-key", base_url=fake.base_url)
+    """
+
+    def __init__(self, reply=DEFAULT_REPLY, delay=0.0, port=0):
+        self.server = _Server(("127.0.0.1", port), make_handler(reply, delay))
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1beta"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    fake = FakeGemini(delay=args.delay, port=args.port)
+    print(f"Fake Gemini on {fake.base_url}")
+    fake.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
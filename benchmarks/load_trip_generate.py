@@ -0,0 +1,100 @@
+# benchmarks/load_trip_generate.py
+# Concurrent /api/trip/generate load against a stubbed Gemini, comparing
+# the old blocking handler (sync def + requests) with the async one, and
+# measuring /api/ping latency while the burst is in flight.
+#
+#   python -m benchmarks.load_trip_generate [--requests N] [--delay S]
+#
+# Uses a throwaway SQLite database and skips Firebase auth.
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fake_gemini import FakeGemini
+
+
+def build_app():
+    # Imported late: settings read GEMINI_BASE_URL / DATABASE_URL from env
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+
+    from app.api.deps import get_current_user
+    from app.api.trip_routes import convert_ai_to_itinerary, router
+    from app.db.database import get_db, init_db
+    from app.db.models import Trip
+    from app.main import app
+    from app.services.gemini_client import ask_gemini
+
+    @router.post("/generate-blocking")
+    def generate_trip_blocking(data: dict, user=Depends(get_current_user), db: Session = Depends(get_db)):
+        # The pre-async handler: holds a threadpool worker for the whole
+        # Gemini call (no itinerary cache, to compare like with like)
+        ai_text = ask_gemini(f"{data['days']}-day trip from {data['from']} to {data['to']}")
+        trip = Trip(
+            user_id=user.get("uid"),
+            from_place=data["from"],
+            to_place=data["to"],
+            days=int(data["days"]),
+            style=data["style"],
+            ai_raw_text=ai_text,
+        )
+        db.add(trip)
+        db.commit()
+        db.refresh(trip)
+        return {"trip_id": trip.id, "itinerary": convert_ai_to_itinerary(ai_text)}
+
+    init_db()  # ASGITransport does not run the lifespan
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: {"uid": "load-test"}
+    return app
+
+
+async def burst(client, path, n):
+    async def one(i):
+        # Unique destination per request so the itinerary cache never hits
+        body = {"from": "Bangalore", "to": f"Town {i}", "days": "2", "style": "Relaxed"}
+        resp = await client.post(path, json=body)
+        resp.raise_for_status()
+
+    async def ping_probe():
+        await asyncio.sleep(0.3)  # let the burst occupy the server first
+        start = time.perf_counter()
+        resp = await client.get("/api/ping")
+        resp.raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(ping_probe(), *(one(i) for i in range(n)))
+    return time.perf_counter() - start, results[0]
+
+
+async def run(n):
+    import httpx
+
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        print(f"{n} concurrent requests")
+        print(f"{'handler':<10} {'total s':>8} {'req/s':>8} {'ping ms':>9}")
+        for name, path in (("blocking", "/api/trip/generate-blocking"), ("async", "/api/trip/generate")):
+            total, ping = await burst(client, path, n)
+            print(f"{name:<10} {total:>8.2f} {n / total:>8.1f} {ping * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with FakeGemini(delay=args.delay) as fake:
+        os.environ["GEMINI_BASE_URL"] = fake.base_url
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "load.db")
+        asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/profile_startup.py
+# Startup-time report for the FastAPI app: wall time to import app.main and
+# run its startup, plus the slowest imports from `python -X importtime`,
+# each measured in a fresh interpreter like a newly spawned uvicorn worker.
+#
+#   python -m benchmarks.profile_startup [--runs N] [--top N]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+STARTUP = """
+import asyncio, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+
+async def startup():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        pass
+
+asyncio.run(startup())
+t2 = time.perf_counter()
+print(f"{t1 - t0} {t2 - t1}")
+"""
+
+
+def run_python(args, env):
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime lines: "import time: self_us | cumulative_us | <indent>module".
+    Returns [(module, self_us, cumulative_us, depth)].
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "profile")
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db")
+
+    imports, startups = [], []
+    for _ in range(args.runs):
+        out = run_python(["-c", STARTUP], env).stdout.split()
+        imports.append(float(out[0]))
+        startups.append(float(out[1]))
+
+    print(f"{args.runs} fresh interpreters")
+    print(f"import app.main   {statistics.median(imports) * 1000:8.1f} ms")
+    print(f"lifespan startup  {statistics.median(startups) * 1000:8.1f} ms")
+
+    rows = parse_importtime(run_python(["-X", "importtime", "-c", "import app.main"], env).stderr)
+
+    # Direct imports of app modules and top-level third-party packages:
+    # the rows worth acting on, without double counting their children
+    interesting = [
+        r for r in rows
+        if r[0].startswith("app.") or (r[3] <= 1 and "." not in r[0])
+    ]
+    interesting.sort(key=lambda r: r[2], reverse=True)
+
+    print()
+    print(f"{'module':<40} {'self ms':>8} {'cumul ms':>9}")
+    for name, self_us, cumulative_us, _ in interesting[:args.top]:
+        print(f"{name:<40} {self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,311 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
-import requests
 import cv2
-from io import BytesIO
+import numpy as np
+
+from app.services.code_scan import expiry_from_codes
+from app.services.date_extract import extract_expiry
+from app.services.debug_trace import get_trace_sink
+from app.services.expiry_roi import ocr_expiry_regions
+from app.services.http_client import get_http_client
+from app.services.ocr_cache import get_ocr_cache, make_cache_key
+from app.services.ocr_engine import get_engine, warm_engine
+from app.services.ocr_preprocess import PREPROCESS_PARAMS, decode_gray, preprocess_image
 
 
 app = Flask(__name__)
 CORS(app)
 
 # -----------------------------------
-# CLEAN DOCUMENT PREPROCESSING
+# OCR MODES
 # -----------------------------------
-def preprocess_image(img):
+# "full": OCR the whole page. "expiry_fast": find the expiry keywords on
+# a coarse pass, OCR only the regions around them (whole page when none)
+OCR_MODES = ("full", "expiry_fast")
 
-    # Rotate if image is sideways
-    if img.shape[1] > img.shape[0]:
-        img = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
 
-    # Upscale for better OCR
-    img = cv2.resize(
-        img, None,
-        fx=2.5, fy=2.5,
-        interpolation=cv2.INTER_CUBIC
-    )
+# -----------------------------------
+# TILE-PARALLEL OCR
+# -----------------------------------
+# Threads the bands of one page are OCR'd on (Tesseract releases the
+# GIL). Batch worker processes use 1: whole documents already keep
+# every core busy there.
+TILE_WORKERS = int(os.environ.get("OCR_TILE_WORKERS", os.cpu_count() or 1))
+
+_tile_pool = None
+_tile_pool_lock = threading.Lock()
+
+
+def get_tile_pool():
+    """Shared band pool, or None (bands run inline) with TILE_WORKERS <= 1."""
+    global _tile_pool
+    if TILE_WORKERS <= 1:
+        return None
+    if _tile_pool is None:
+        with _tile_pool_lock:
+            if _tile_pool is None:
+                _tile_pool = ThreadPoolExecutor(max_workers=TILE_WORKERS, thread_name_prefix="ocr-tile")
+    return _tile_pool
+
+
+def split_bands(gray, tile_height, overlap):
+    """
+    Horizontal bands of the page as (top, bottom, own_top, own_bottom).
+    Cuts go through the gaps between text lines (the row with the least
+    ink near each multiple of tile_height); each band reaches overlap px
+    past its own rows, so a line a cut goes through is still whole in
+    the band that owns its centre.
+    """
+    h = gray.shape[0]
+    if not tile_height or h < tile_height * 1.5:
+        return [(0, h, 0, h)]
+
+    # Dark pixels per row, smoothed over a few rows
+    _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    profile = np.convolve(ink.sum(axis=1, dtype=np.int64), np.ones(5), mode="same")
+
+    cuts = [0]
+    window = tile_height // 4
+    while h - cuts[-1] >= tile_height * 1.5:
+        lo = cuts[-1] + tile_height - window
+        segment = profile[lo:lo + 2 * window]
+        # Of the emptiest rows, the one closest to the target height
+        gaps = np.flatnonzero(segment == segment.min())
+        cuts.append(lo + int(gaps[np.argmin(np.abs(gaps - window))]))
+    cuts.append(h)
+
+    return [
+        (max(top - overlap, 0), min(bottom + overlap, h), top, bottom)
+        for top, bottom in zip(cuts, cuts[1:])
+    ]
 
-    # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    # Light denoising only (NO thresholding)
-    gray = cv2.medianBlur(gray, 3)
+def words_to_text(words):
+    """Words in reading order: lines by vertical centre, then left to right."""
+    lines = []
+    for word in sorted(words, key=lambda w: w.top + w.height / 2):
+        centre = word.top + word.height / 2
+        if lines and abs(centre - lines[-1][0]) <= lines[-1][1] / 2:
+            lines[-1][2].append(word)
+        else:
+            lines.append((centre, word.height, [word]))
+    return "\n".join(
+        " ".join(w.text for w in sorted(line, key=lambda w: w.left))
+        for _, _, line in lines
+    )
+
 
-    return gray
+def ocr_page(gray, params=PREPROCESS_PARAMS, executor=None):
+    """
+    Full-page OCR. Tall pages (multi-paragraph policies) are split with
+    split_bands and the bands OCR'd in parallel on executor (the tile
+    pool by default); the text is rebuilt from their word boxes, each
+    word kept only by the band that owns it, so overlaps aren't doubled.
+    The split doesn't depend on the number of workers: neither does the
+    text.
+    """
+    engine = get_engine()
+    bands = split_bands(gray, params["tile_height"], params["tile_overlap"])
+    if len(bands) == 1:
+        return engine.image_to_string(gray)
+
+    def read(band):
+        top, bottom, own_top, own_bottom = band
+        return [
+            word._replace(top=word.top + top)
+            for word in engine.image_to_data(gray[top:bottom])
+            if own_top <= word.top + top + word.height / 2 < own_bottom
+        ]
+
+    executor = executor or get_tile_pool()
+    results = executor.map(read, bands) if executor else map(read, bands)
+    return words_to_text([word for band in results for word in band])
 
 
 # -----------------------------------
-# EXPIRY DATE EXTRACTION
+# OCR PIPELINE (shared by /ocr-url and /ocr-batch)
 # -----------------------------------
+def download_image(file_url):
+    # Pooled keep-alive client: timeouts, size cap, conditional GET
+    return get_http_client().fetch(file_url)
+
+
+def ocr_image_bytes(img_bytes, trace_id=None, mode="full"):
+    """
+    Returns (text, path): path is "qr" when a QR code/barcode on the
+    document carried a validity date (its payload is the text), "roi"
+    when mode="expiry_fast" read just the text around expiry keywords,
+    "ocr" when Tesseract read the page.
+    """
+    # Straight to grayscale: no RGB copy, no BGR copy, no second gray pass
+    img = decode_gray(img_bytes, PREPROCESS_PARAMS["decode_reduce"])
+
+    # Debug images are only written for traced requests, off-thread
+    trace = get_trace_sink()
+    trace.submit(trace_id, "received_raw.jpg", img)
+
+    # ⚡ Fast path: RC/DL/PUC QR codes often encode the validity date
+    if PREPROCESS_PARAMS["code_fastpath"]:
+        found = expiry_from_codes(img)
+        if found:
+            return found[0], "qr"
+
+    # Preprocess
+    processed = preprocess_image(img)
+
+    trace.submit(trace_id, "processed_output.jpg", processed)
+
+    if mode == "expiry_fast":
+        text = ocr_expiry_regions(processed, get_engine(), PREPROCESS_PARAMS["expiry_fast_scale"])
+        if text is not None:
+            return text, "roi"
+
+    # 🔥 DOCUMENT OCR MODE (THIS FIXES GARBAGE TEXT)
+    # --oem 3 --psm 11 -l eng --dpi 300, on a warm engine when available;
+    # tall pages in parallel bands
+    return ocr_page(processed), "ocr"
+
+
+# Requests and time per serving path ("cache", "qr", "roi", "ocr"), to
+# see how much Tesseract time the fast paths save
+_path_stats = {}
+_path_stats_lock = threading.Lock()
+
+
+def record_path(path, seconds):
+    with _path_stats_lock:
+        count, total = _path_stats.get(path, (0, 0.0))
+        _path_stats[path] = (count + 1, total + seconds)
+
+
+def path_stats():
+    with _path_stats_lock:
+        stats = {
+            path: {"requests": count, "avg_ms": round(total / count * 1000, 1)}
+            for path, (count, total) in _path_stats.items()
+        }
+    if "ocr" in stats:
+        saved = sum(
+            stats[path]["requests"] * (stats["ocr"]["avg_ms"] - stats[path]["avg_ms"])
+            for path in ("qr", "roi") if path in stats
+        )
+        stats["tesseract_ms_saved"] = round(saved, 1)
+    return stats
+
+
+def ocr_document(file_url, run_ocr=ocr_image_bytes, debug=False, mode="full"):
+    """
+    Download, then serve the text from the OCR cache or run run_ocr on
+    a miss. run_ocr lets /ocr-batch push the CPU work to the worker pool
+    while the download and cache lookup stay in this process.
+    debug=True forces a debug trace of the images for this document;
+    mode is one of OCR_MODES.
+    """
+    img_bytes = download_image(file_url)
+
+    # expiry_fast text is only the regions around the keywords: cached
+    # apart from the full page
+    params = PREPROCESS_PARAMS if mode == "full" else {**PREPROCESS_PARAMS, "mode": mode}
+    key = make_cache_key(img_bytes, params, get_engine().config)
+    cache = get_ocr_cache()
+
+    trace_id = None
+    start = time.perf_counter()
+    text = cache.get(key)
+    if text is not None:
+        cache_status = "hit"
+        path = "cache"
+    else:
+        cache_status = "miss"
+        trace_id = get_trace_sink().start_trace(force=debug)
+        text, path = run_ocr(img_bytes, trace_id, mode)
+        cache.put(key, text)
+    record_path(path, time.perf_counter() - start)
+
+    expiry = extract_expiry(text)
+
+    result = {
+        "extracted_text": text.strip(),
+        "expiry_date": expiry.text if expiry else "Not detected",
+        "expiry_date_iso": expiry.iso if expiry else None,
+        "cache": cache_status,
+        "path": path,
+    }
+    if trace_id:
+        result["trace_id"] = trace_id
+    return result
+
+
 # -----------------------------------
-# EXPIRY DATE EXTRACTION (FIXED)
+# OCR WORKER POOL
 # -----------------------------------
-def extract_expiry(text):
-    text = text.replace("\n", " ")
-
-    patterns = [
-        # expiry / valid till / valid upto / expires → FULL DATE
-        r"(?:expiry\s*date|valid\s*upto|valid\s*till|expires)[^\d]*"
-        r"(\d{1,2}(?:st|nd|rd|th)?\s*(?:of\s*)?"
-        r"(?:January|February|March|April|May|June|July|August|September|October|November|December)"
-        r"[,\s]*\d{4})",
-
-        # 28th May 2024
-        r"(\d{1,2}(?:st|nd|rd|th)?\s*"
-        r"(?:January|February|March|April|May|June|July|August|September|October|November|December)"
-        r"\s*\d{4})",
-
-        # May 28 2024
-        r"((?:January|February|March|April|May|June|July|August|September|October|November|December)"
-        r"\s*\d{1,2}\s*\d{4})",
-
-        # 28/05/2024 or 28-05-2024
-        r"(\d{1,2}[\/\-.]\d{1,2}[\/\-.]\d{2,4})",
-
-        # 2024/05/28
-        r"(\d{4}[\/\-.]\d{1,2}[\/\-.]\d{1,2})"
-    ]
+# Worker processes live for the lifetime of the server so a batch only
+# pays for OCR, not for spawning interpreters and importing cv2.
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", os.cpu_count() or 1))
+OCR_BATCH_MAX = int(os.environ.get("OCR_BATCH_MAX", 20))
+# Seconds one document may spend in a worker before it is reported as
+# failed (the rest of the batch still comes back)
+OCR_TIMEOUT = float(os.environ.get("OCR_TIMEOUT", 120))
+
+# Workers start from a clean forkserver (spawn where there is none),
+# never fork()ed from the threaded server: another request thread, the
+# trace writer or the HTTP client may hold a lock at that moment
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    # Bands run inline here, never on a tile pool the worker didn't
+    # start itself (a fork() would inherit the pool but none of its threads)
+    global TILE_WORKERS, _tile_pool
+    TILE_WORKERS = 1
+    _tile_pool = None
+    warm_engine()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=OCR_WORKERS,
+                    mp_context=multiprocessing.get_context(_START_METHOD),
+                    initializer=_init_worker,
+                )
+    return _pool
+
+
+def _ocr_in_pool(img_bytes, trace_id=None, mode="full"):
+    future = get_pool().submit(ocr_image_bytes, img_bytes, trace_id, mode)
+    try:
+        return future.result(timeout=OCR_TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        raise TimeoutError(f"OCR did not finish within {OCR_TIMEOUT:g}s") from None
 
-    for p in patterns:
-        m = re.search(p, text, re.IGNORECASE)
-        if m:
-            return m.group(1)   # ✅ ALWAYS FULL DATE
 
-    return None
+def _batch_item(file_url, debug=False, mode="full"):
+    # Download + cache lookup run on a thread here, only cache misses go
+    # to the worker processes. Never let one bad document take down the
+    # rest of the batch.
+    try:
+        result = ocr_document(file_url, run_ocr=_ocr_in_pool, debug=debug, mode=mode)
+        result["success"] = True
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+    result["file_url"] = file_url
+    return result
 
 
 # -----------------------------------
@@ -79,47 +313,96 @@ def extract_expiry(text):
 # -----------------------------------
 @app.route("/ocr-url", methods=["POST"])
 def ocr_from_url():
+    """
+    POST /ocr-url
+    Body JSON: {"file_url": "https://...", "debug": false, "mode": "full"}
+    mode="expiry_fast" OCRs only the text around the expiry keywords
+    (extracted_text is then just those lines).
+    """
     try:
         data = request.json
         file_url = data.get("file_url")
+        mode = data.get("mode", "full")
+        if mode not in OCR_MODES:
+            return jsonify({"success": False, "error": f"mode must be one of {', '.join(OCR_MODES)}"}), 400
 
         print("\n🔥 New OCR request")
         print("Image URL:", file_url)
 
-        # Download image
-        img_bytes = requests.get(file_url).content
-        pil_img = Image.open(BytesIO(img_bytes)).convert("RGB")
-        img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        result = ocr_document(file_url, debug=bool(data.get("debug")), mode=mode)
 
-        # Save raw image (debug)
-        cv2.imwrite("received_raw.jpg", img)
+        print("Served by:", result["path"])
+        print("\n--- OCR TEXT START ---")
+        print(result["extracted_text"])
+        print("--- OCR TEXT END ---\n")
 
-        # Preprocess
-        processed = preprocess_image(img)
+        return jsonify({"success": True, **result})
 
-        # Save processed image (debug)
-        cv2.imwrite("processed_output.jpg", processed)
+    except Exception as e:
+        print("❌ ERROR:", e)
+        return jsonify({"success": False, "error": str(e)}), 500
 
-        # 🔥 DOCUMENT OCR MODE (THIS FIXES GARBAGE TEXT)
-        config = "--oem 3 --psm 11 -l eng --dpi 300"
-        text = pytesseract.image_to_string(processed, config=config)
 
-        print("\n--- OCR TEXT START ---")
-        print(text)
-        print("--- OCR TEXT END ---\n")
+# -----------------------------------
+# SERVING PATH STATS
+# -----------------------------------
+@app.route("/ocr-stats", methods=["GET"])
+def ocr_stats():
+    """
+    Requests and average latency per serving path since startup:
+    {"cache": {...}, "qr": {...}, "ocr": {...}, "tesseract_ms_saved": ...}
+    """
+    return jsonify(path_stats())
 
-        expiry = extract_expiry(text)
 
+# -----------------------------------
+# BATCH OCR API ROUTE
+# -----------------------------------
+@app.route("/ocr-batch", methods=["POST"])
+def ocr_batch():
+    """
+    OCR several documents in one call:
+    POST /ocr-batch
+    Body JSON:
+    {
+      "file_urls": ["https://...rc.jpg", "https://...insurance.jpg"],
+      "debug": false,
+      "mode": "full"
+    }
+    Documents are processed in parallel on the worker pool; results come
+    back in the same order as file_urls.
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    file_urls = data.get("file_urls")
+
+    if not isinstance(file_urls, list) or not file_urls:
+        return jsonify({"success": False, "error": "file_urls missing"}), 400
+
+    if len(file_urls) > OCR_BATCH_MAX:
         return jsonify({
-            "success": True,
-            "extracted_text": text.strip(),
-            "expiry_date": expiry or "Not detected"
-        })
+            "success": False,
+            "error": f"At most {OCR_BATCH_MAX} documents per batch"
+        }), 400
+
+    mode = data.get("mode", "full")
+    if mode not in OCR_MODES:
+        return jsonify({"success": False, "error": f"mode must be one of {', '.join(OCR_MODES)}"}), 400
 
+    print(f"\n🔥 New OCR batch: {len(file_urls)} documents")
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(file_urls)) as downloads:
+            results = list(downloads.map(
+                _batch_item, file_urls,
+                [bool(data.get("debug"))] * len(file_urls),
+                [mode] * len(file_urls),
+            ))
     except Exception as e:
         print("❌ ERROR:", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
+    return jsonify({"success": True, "results": results})
+
 
 # -----------------------------------
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+# tests/test_date_extract.py
+# extract_expiry over the OCR-output corpus benchmarks/bench_expiry also
+# times: every document must come back with its expected expiry.
+import json
+import os
+
+import pytest
+
+from app.services.date_extract import extract_expiry
+
+CORPUS = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "data", "expiry_corpus.json")
+
+with open(CORPUS, encoding="utf-8") as f:
+    DOCUMENTS = json.load(f)
+
+
+@pytest.mark.parametrize(
+    "document", DOCUMENTS,
+    ids=[f"{i}-{doc['doc_type']}" for i, doc in enumerate(DOCUMENTS)],
+)
+def test_expiry_corpus(document):
+    found = extract_expiry(document["text"])
+    assert found is not None
+    assert found.iso == document["expected"]
@@ -0,0 +1,61 @@
+# tests/test_ocr_engine.py
+# TesserocrEngine's handle pool, with a stand-in for the tesserocr
+# bindings: no libtesseract needed.
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services import ocr_engine
+
+
+class FakeApi:
+    created = 0
+
+    def __init__(self, **kwargs):
+        type(self).created += 1
+        self.busy = False
+
+    def SetVariable(self, name, value):
+        pass
+
+    def SetImageBytes(self, data, w, h, bpp, bpl):
+        assert not self.busy, "handle used by two threads at once"
+        self.busy = True
+
+    def GetUTF8Text(self):
+        time.sleep(0.01)
+        self.busy = False
+        return "VALID UPTO 01/01/2030"
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    FakeApi.created = 0
+    monkeypatch.setattr(ocr_engine, "tesserocr", type("tesserocr", (), {"PyTessBaseAPI": FakeApi}))
+    return ocr_engine.TesserocrEngine(max_handles=2)
+
+
+def run_in_fresh_threads(engine, count):
+    img = np.full((32, 32), 255, np.uint8)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(engine.image_to_string(img))) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_handles_outlive_request_threads(engine):
+    engine.warm()
+    for _ in range(5):
+        run_in_fresh_threads(engine, 1)
+    assert FakeApi.created == 1
+
+
+def test_concurrent_calls_share_at_most_max_handles(engine):
+    results = run_in_fresh_threads(engine, 8)
+    assert results == ["VALID UPTO 01/01/2030"] * 8
+    assert FakeApi.created == 2
@@ -0,0 +1,188 @@
+# tests/test_token_verifier.py
+# FirebaseTokenVerifier against locally generated keys: no network, no
+# Firebase project.
+import datetime
+import time
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.services.token_verifier import CertCache, FirebaseTokenVerifier, InvalidTokenError
+
+PROJECT_ID = "test-project"
+KID = "test-kid"
+
+
+def make_signing_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, cert.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return make_signing_key()
+
+
+@pytest.fixture
+def fetches(signing_key):
+    calls = []
+
+    def fetch():
+        calls.append(time.time())
+        return {KID: signing_key[1]}, 3600
+
+    fetch.calls = calls
+    return fetch
+
+
+@pytest.fixture
+def verifier(fetches):
+    certs = CertCache(fetch=fetches)
+    certs.refresh()
+    return FirebaseTokenVerifier(PROJECT_ID, certs)
+
+
+def make_token(key, headers=None, algorithm="RS256", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "user-1",
+        "iat": now,
+        "auth_time": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm=algorithm, headers={"kid": KID, **(headers or {})})
+
+
+def test_valid_token(verifier, signing_key):
+    claims = verifier.verify(make_token(signing_key[0]))
+    assert claims["uid"] == "user-1"
+    assert claims["aud"] == PROJECT_ID
+
+
+@pytest.mark.parametrize("overrides", [
+    {"exp": int(time.time()) - 10},
+    {"aud": "someone-else"},
+    {"iss": "https://securetoken.google.com/someone-else"},
+    {"sub": ""},
+    {"sub": "x" * 129},
+    {"auth_time": int(time.time()) + 3600},
+], ids=["expired", "wrong-aud", "wrong-iss", "empty-sub", "long-sub", "future-auth-time"])
+def test_rejects_bad_claims(verifier, signing_key, overrides):
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token(signing_key[0], **overrides))
+    assert verifier.stats()["failures"] == 1
+
+
+def test_rejects_wrong_key(verifier):
+    other_key, _ = make_signing_key()
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token(other_key))
+
+
+def test_rejects_non_rs256(verifier):
+    hs256 = make_token("a-shared-secret-of-at-least-32-bytes", algorithm="HS256")
+    unsigned = make_token(None, algorithm="none")
+    for token in (hs256, unsigned):
+        with pytest.raises(InvalidTokenError, match="RS256"):
+            verifier.verify(token)
+
+
+def test_rejects_missing_kid_without_fetching(verifier, signing_key, fetches):
+    token = jwt.encode(
+        {"sub": "user-1", "aud": PROJECT_ID, "exp": int(time.time()) + 60, "iat": int(time.time())},
+        signing_key[0], algorithm="RS256",
+    )
+    with pytest.raises(InvalidTokenError, match="key id"):
+        verifier.verify(token)
+    assert len(fetches.calls) == 1  # only the refresh in the fixture
+
+
+def test_unknown_kids_refresh_at_most_once_per_interval(verifier, signing_key, fetches):
+    for i in range(20):
+        with pytest.raises(InvalidTokenError, match="Unknown signing key"):
+            verifier.verify(make_token(signing_key[0], headers={"kid": f"random-{i}"}))
+    # Fixture refresh + one forced refresh for the whole burst
+    assert len(fetches.calls) == 2
+    assert verifier.verify(make_token(signing_key[0]))["uid"] == "user-1"
+
+
+def test_garbage_token(verifier):
+    with pytest.raises(InvalidTokenError):
+        verifier.verify("not.a.token")
+
+
+def test_cache_hit(verifier, signing_key):
+    token = make_token(signing_key[0])
+    verifier.verify(token)
+    verifier.verify(token)
+    stats = verifier.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_cache_entry_expires_at_exp(verifier, signing_key, monkeypatch):
+    exp = int(time.time()) + 3600
+    token = make_token(signing_key[0], exp=exp)
+    verifier.verify(token)
+    verifier.verify(token)
+    assert verifier.stats()["hits"] == 1
+
+    # Past exp (by the verifier's clock) the cached claims are dropped
+    # and the token goes through the full check again
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 3601)
+    verifier.verify(token)
+    stats = verifier.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_expired_token_is_not_served_from_cache(verifier, signing_key):
+    exp = int(time.time()) + 1
+    token = make_token(signing_key[0], exp=exp)
+    verifier.verify(token)
+    time.sleep(max(0.0, exp - time.time()) + 0.1)
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(token)
+
+
+def test_failed_first_fetch_is_retried_once_per_interval(signing_key, monkeypatch):
+    calls = []
+
+    def fetch():
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise ConnectionError("certs unreachable")
+        return {KID: signing_key[1]}, 3600
+
+    certs = CertCache(fetch=fetch, min_refresh=60)
+    certs.start()
+    verifier = FirebaseTokenVerifier(PROJECT_ID, certs)
+
+    token = make_token(signing_key[0])
+    for _ in range(20):
+        with pytest.raises(InvalidTokenError, match="Unknown signing key"):
+            verifier.verify(token)
+    assert len(calls) == 1
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 61)
+    assert verifier.verify(token)["uid"] == "user-1"
+    assert len(calls) == 2